@@ -4,7 +4,13 @@ from .data_service.local_data import LocalDataError, LocalDataService
 from .data_service.remote_data import RemoteDataService
 from .data_service.request_result import RequestResult
 from .database import SQLiteDatabase
-from .entry import APIEntry, APIEntryManager, SiteEntry, SiteEntryManager
+from .entry import (
+    APIEntry,
+    APIEntryManager,
+    APIRequestContext,
+    SiteEntry,
+    SiteEntryManager,
+)
 from .model import DataResource, DataType
 from .service import (
     ApiDeleteService,
@@ -23,6 +29,7 @@ __all__ = [
     "RequestResult",
     "APIEntry",
     "APIEntryManager",
+    "APIRequestContext",
     "SiteEntry",
     "SiteEntryManager",
     "APICoreApp",
@@ -4,10 +4,16 @@ import asyncio
 from pathlib import Path
 
 from ..config import PluginConfig
-from .data_service import DataService, LocalDataService, RemoteDataService
+from .data_service import (
+    DataService,
+    LocalDataService,
+    RemoteDataService,
+    ResponseCache,
+)
 from .database import SQLiteDatabase
 from .entry import APIEntryManager, SiteEntryManager
 from .log import logger, setup_default_logging
+from .model import ConnectorOptions, DataType, SiteLimitOptions
 from .service import (
     ApiDeleteService,
     ApiTestService,
@@ -35,8 +41,56 @@ class APICoreApp:
         self.local = LocalDataService(self.cfg.local_dir)
         self.api_mgr = APIEntryManager(self.db)
         self.site_mgr = SiteEntryManager(self.db)
-        self.remote = RemoteDataService(self.api_mgr, self.site_mgr)
-        self.data_service = DataService(self.remote, self.local)
+        self.remote = RemoteDataService(
+            self.api_mgr,
+            self.site_mgr,
+            connector=ConnectorOptions(
+                max_connections=self.cfg.max_connections,
+                max_connections_per_host=self.cfg.max_connections_per_host,
+                keepalive_timeout=self.cfg.keepalive_timeout,
+                dns_cache_ttl=self.cfg.dns_cache_ttl,
+            ),
+            limits=SiteLimitOptions(
+                max_in_flight=self.cfg.site_max_in_flight,
+                rate_per_second=self.cfg.site_rate_limit,
+                burst=self.cfg.site_burst,
+            ),
+            queue_timeout=self.cfg.site_queue_timeout,
+            max_response_bytes={
+                DataType.TEXT: self._mb_to_bytes(self.cfg.max_text_size_mb),
+                DataType.IMAGE: self._mb_to_bytes(self.cfg.max_image_size_mb),
+                DataType.VIDEO: self._mb_to_bytes(self.cfg.max_video_size_mb),
+                DataType.AUDIO: self._mb_to_bytes(self.cfg.max_audio_size_mb),
+            },
+            hedge_width=self.cfg.link_hedge_width,
+            link_timeout=self.cfg.link_timeout,
+            breaker_threshold=self.cfg.breaker_failure_threshold,
+            breaker_cooldown=self.cfg.breaker_cooldown,
+            timeout_factor=self.cfg.adaptive_timeout_factor,
+            timeout_bounds=(
+                self.cfg.adaptive_timeout_min,
+                self.cfg.adaptive_timeout_max,
+            ),
+            save_latency=self.db.save_site_latency,
+            negative_ttl=self.cfg.negative_cache_ttl,
+        )
+        self.response_cache = ResponseCache(
+            self.db, capacity=self.cfg.response_cache_size
+        )
+        self.data_service = DataService(
+            self.remote,
+            self.local,
+            self.response_cache,
+            coalesce=self.cfg.coalesce_requests,
+            latency_budget=self.cfg.latency_budget,
+        )
+        self.data_service.enable_prefetch(
+            depth=self.cfg.prefetch_depth,
+            names=self.cfg.prefetch_apis,
+            hot_threshold=self.cfg.prefetch_hot_threshold,
+            max_bytes=self._mb_to_bytes(self.cfg.prefetch_max_mb),
+            site_concurrency=self.cfg.prefetch_site_concurrency,
+        )
         self.site_sync_service = SiteSyncService(self.api_mgr, self.site_mgr)
         self.api_delete_service = ApiDeleteService(self.api_mgr)
         self.api_test_service = ApiTestService(self.remote, self.local, self.api_mgr)
@@ -51,6 +105,10 @@ class APICoreApp:
 
         self._started = False
 
+    @staticmethod
+    def _mb_to_bytes(value: float) -> int:
+        return max(0, int(value * 1024 * 1024))
+
     async def start(self) -> None:
         """Start core services.
 
@@ -72,8 +130,12 @@ class APICoreApp:
             self.api_mgr.initialize(),
             self.site_mgr.initialize(),
         )
+        self.remote.latency.load(self.db.load_site_latency())
+        self.local.start(reconcile_interval=self.cfg.local_reconcile_interval)
         logger.info("[app] api entries: %d", len(self.api_mgr.entries))
         logger.info("[app] site entries: %d", len(self.site_mgr.entries))
+        if self.data_service.prefetch is not None:
+            self.data_service.prefetch.start()
         self._started = True
         logger.info("[app] startup complete")
 
@@ -86,8 +148,11 @@ class APICoreApp:
             logger.info("[app] stop skipped: not running")
             return
         logger.info("[app] shutting down")
+        if self.data_service.prefetch is not None:
+            await self.data_service.prefetch.stop(discard=not self.cfg.save_data)
         await self.remote.close()
-        logger.info("[app] remote session closed")
+        logger.info("[app] remote sessions closed")
+        await self.local.stop()
         self._started = False
         logger.info("[app] shutdown complete")
 
@@ -1,9 +1,16 @@
-from ..entry import APIEntry
+import asyncio
+import json
+from typing import Any
+
+from ..entry import APIRequestContext
 from ..log import logger
 from ..model import DataResource
 from .local_data import LocalDataService
+from .prefetch import PrefetchBuffer
 from .remote_data import RemoteDataService
 from .request_result import RequestResult as RequestResult
+from .response_cache import ResponseCache
+from .single_flight import SingleFlight
 
 
 class DataService:
@@ -13,31 +20,162 @@ class DataService:
         self,
         remote: RemoteDataService,
         local: LocalDataService,
+        cache: ResponseCache | None = None,
+        coalesce: bool = True,
+        latency_budget: float = 0.0,
     ) -> None:
         self.remote = remote
         self.local = local
+        self.cache = cache
+        self.flights = SingleFlight() if coalesce else None
+        self.prefetch: PrefetchBuffer | None = None
+        # Seconds to wait for the remote before answering from local data;
+        # 0 always waits for the remote.
+        self.latency_budget = latency_budget
+        self._background: set[asyncio.Future[DataResource | None]] = set()
+
+    def enable_prefetch(self, **options: Any) -> PrefetchBuffer:
+        """Serve hot APIs from a prefetch buffer; see `PrefetchBuffer`."""
+        self.prefetch = PrefetchBuffer(
+            self.remote.api_mgr,
+            lambda request: self._fetch(request, use_local=False),
+            site_key=lambda entry: self.remote.get_template(entry).site_key,
+            **options,
+        )
+        return self.prefetch
+
+    def _cache_key(self, request: APIRequestContext) -> str | None:
+        """Response cache key of `request`, or `None` when it is not cached."""
+        entry = request.entry
+        if self.cache is None or not entry.data_type.is_text or entry.cache.is_empty:
+            return None
+        params = self.remote.get_template(entry).build_params(request)
+        return ResponseCache.make_key(entry, params)
 
     async def fetch(
-        self, entry: APIEntry, *, use_local: bool = True
+        self,
+        request: APIRequestContext,
+        *,
+        use_local: bool = True,
+        save_data: bool = True,
     ) -> DataResource | None:
-        """Fetch data by entry, save to local storage, then return normalized resource.
+        """Fetch data by request, save to local storage, then return normalized resource.
 
         Behavior:
-        - Try remote first.
+        - Hot APIs are served from the prefetch buffer when it has an item.
+        - Concurrent fetches of the same entry and effective params share one
+          call (up to `entry.fanout` distinct calls); each caller gets its own
+          handle, see `DataResource.share`.
+        - Serve text APIs with a cache policy from the response cache.
+        - Try remote first. With a `latency_budget` and `use_local=True`, a
+          remote call still running after the budget is left to finish (and
+          save its result) in the background while a random local item is
+          returned right away. With `save_data=False` that result is deleted
+          once it arrives, as the caller never gets to send and drop it.
         - On remote failure and `use_local=True`, fallback to random local item.
         - Return `None` when both paths fail.
 
         Returns:
             A `DataResource` with either `saved_text` or `saved_path`, or `None`.
         """
+        if self.prefetch is not None:
+            data = self.prefetch.pop(request)
+            if data is not None:
+                return data
+        if self.latency_budget <= 0 or not use_local:
+            return await self._fetch_shared(request, use_local=use_local)
+
+        task = asyncio.ensure_future(self._fetch_shared(request, use_local=use_local))
+        try:
+            done, _ = await asyncio.wait({task}, timeout=self.latency_budget)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if task in done:
+            return task.result()
+
+        entry = request.entry
+        try:
+            local_data = await self.local.get_random_data(entry.data_type, entry.name)
+        except Exception as e:
+            logger.debug(f"No local data within latency budget [{entry.name}] : {e}")
+            return await task
+        logger.info(f"Latency budget exceeded [{entry.name}], served local data")
+        self._background.add(task)
+        task.add_done_callback(
+            lambda done: self._finish_background(done, save_data=save_data)
+        )
+        return local_data
+
+    def _finish_background(
+        self, task: asyncio.Future[DataResource | None], *, save_data: bool
+    ) -> None:
+        self._background.discard(task)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.warning(f"Background fetch failed: {task.exception()}")
+            return
+        data = task.result()
+        if data is not None and not save_data:
+            data.unlink()
+
+    async def _fetch_shared(
+        self, request: APIRequestContext, *, use_local: bool
+    ) -> DataResource | None:
+        if self.flights is None:
+            return await self._fetch(request, use_local=use_local)
+        params = self.remote.get_template(request.entry).build_params(request)
+        key = (
+            request.entry.name,
+            json.dumps(dict(params), ensure_ascii=False, sort_keys=True, default=str),
+            use_local,
+        )
+        return await self.flights.run(
+            key,
+            lambda: self._fetch(request, use_local=use_local),
+            fanout=request.entry.fanout,
+        )
+
+    async def _fetch(
+        self, request: APIRequestContext, *, use_local: bool
+    ) -> DataResource | None:
+        entry = request.entry
+        cache_key = self._cache_key(request)
+        if cache_key is not None and self.cache is not None:
+            cached = self.cache.get(entry, cache_key)
+            if cached is not None:
+                return DataResource(
+                    data_type=entry.data_type,
+                    name=entry.name,
+                    text=cached,
+                    saved_text=cached,
+                )
+
+        # Binary payloads stream into a staging file next to the dataset.
+        download_dir = (
+            self.local.get_download_dir(entry.data_type, entry.name)
+            if entry.data_type.is_binary
+            else None
+        )
 
         # ================== Remote call ==================
         try:
-            result = await self.remote.get_data(entry)
+            result = await self.remote.get_data(request, download_dir=download_dir)
 
             if not result.ok:
+                result.discard_file()
                 raise RuntimeError(result.error or "request not ok")
 
+            if result.file_path is not None:
+                return await self.local.save_downloaded(
+                    entry.data_type,
+                    entry.name,
+                    result.file_path,
+                    content_hash=result.file_hash or "",
+                    size=result.file_size,
+                )
+
             # Build DataResource
             data = DataResource(
                 data_type=entry.data_type,
@@ -48,6 +186,8 @@ class DataService:
 
             # Persist locally (fills saved_* internally)
             saved_data = await self.local.save_data(data)
+            if cache_key is not None and self.cache is not None and result.raw_text:
+                self.cache.put(entry, cache_key, result.raw_text)
 
             return saved_data
 
@@ -0,0 +1,80 @@
+import random
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+
+class BinaryManifest:
+    """Cached file listing of one binary dataset folder.
+
+    Files are named `{name}_{seq}_{hash8}{ext}`; the manifest keeps them in
+    memory together with the next free `seq`, so random picks and saves do
+    not walk the folder. It is (re)loaded by `LocalDataService` from the
+    catalog, or from a folder scan when the folder mtime no longer matches
+    the one recorded after our own last change.
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        dataset_name: str,
+        is_data_file: Callable[[Path], bool],
+    ) -> None:
+        self.folder = folder
+        self.dataset_name = dataset_name
+        self.is_data_file = is_data_file
+        self.files: list[Path] = []
+        self.next_seq = 0
+        self.mtime_ns: int | None = None
+        self.scans = 0
+
+    def folder_mtime(self) -> int:
+        try:
+            return self.folder.stat().st_mtime_ns
+        except FileNotFoundError:
+            return -1
+
+    def parse_seq(self, file_name: str) -> int | None:
+        """Sequence number of `file_name`, or `None` when it is not ours."""
+        prefix = f"{self.dataset_name}_"
+        stem = Path(file_name).stem
+        if not stem.startswith(prefix):
+            return None
+        # stem example: name_12_ab12cd34
+        try:
+            return int(stem[len(prefix) :].split("_", 1)[0])
+        except ValueError:
+            return None
+
+    def is_current(self) -> bool:
+        return self.mtime_ns is not None and self.folder_mtime() == self.mtime_ns
+
+    def scan(self) -> list[Path]:
+        self.scans += 1
+        if not self.folder.is_dir():
+            return []
+        return [p for p in self.folder.iterdir() if self.is_data_file(p)]
+
+    def load(self, files: list[Path], mtime_ns: int) -> None:
+        seqs = [self.parse_seq(p.name) for p in files]
+        self.files = files
+        self.next_seq = max((seq for seq in seqs if seq is not None), default=-1) + 1
+        self.mtime_ns = mtime_ns
+
+    def _sync(self) -> None:
+        """Record the folder mtime after a change we made ourselves."""
+        self.mtime_ns = self.folder_mtime()
+
+    def add(self, path: Path) -> None:
+        self.files.append(path)
+        seq = self.parse_seq(path.name)
+        if seq is not None:
+            self.next_seq = max(self.next_seq, seq + 1)
+        self._sync()
+
+    def remove(self, names: Iterable[str]) -> None:
+        removed = set(names)
+        self.files = [p for p in self.files if p.name not in removed]
+        self._sync()
+
+    def choice(self) -> Path:
+        return random.choice(self.files)
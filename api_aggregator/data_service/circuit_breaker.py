@@ -0,0 +1,214 @@
+import time
+from enum import Enum
+from typing import Any
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class Circuit:
+    """Consecutive-failure circuit for one site or API.
+
+    Opens after `failure_threshold` consecutive failures. Once the cooldown
+    has passed, one caller is let through as a half-open probe: success
+    closes the circuit, failure reopens it with a doubled cooldown (capped
+    at `max_reset_timeout`).
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int,
+        reset_timeout: float,
+        max_reset_timeout: float,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max(reset_timeout, max_reset_timeout)
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.cooldown = reset_timeout
+        self.opened_at = 0.0
+        self.probing = False
+
+    def can_pass(self, now: float) -> bool:
+        if self.state is CircuitState.CLOSED:
+            return True
+        if self.state is CircuitState.OPEN:
+            return now - self.opened_at >= self.cooldown
+        return not self.probing
+
+    def enter(self, now: float) -> None:
+        """Mark a caller admitted by `can_pass`; claims the probe if needed."""
+        if self.state is CircuitState.OPEN and now - self.opened_at >= self.cooldown:
+            self.state = CircuitState.HALF_OPEN
+        if self.state is CircuitState.HALF_OPEN:
+            self.probing = True
+
+    def release(self) -> None:
+        """Give back a probe whose outcome does not count."""
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.cooldown = self.reset_timeout
+        self.probing = False
+
+    def record_failure(self, now: float) -> None:
+        self.failures += 1
+        if self.state is CircuitState.HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, self.max_reset_timeout)
+            self._trip(now)
+        elif self.state is CircuitState.CLOSED and (
+            self.failures >= self.failure_threshold
+        ):
+            self._trip(now)
+
+    def _trip(self, now: float) -> None:
+        self.state = CircuitState.OPEN
+        self.opened_at = now
+        self.probing = False
+
+    def snapshot(self, now: float) -> dict[str, Any]:
+        retry_in = 0.0
+        if self.state is CircuitState.OPEN:
+            retry_in = max(0.0, self.cooldown - (now - self.opened_at))
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "retry_in": round(retry_in, 1),
+        }
+
+
+class SiteCircuit(Circuit):
+    """Site circuit: trips only on failures spread over several APIs.
+
+    One broken API must not block its healthy neighbours, so the streak has
+    to involve at least `MIN_APIS` different APIs (the API's own circuit
+    covers the single-API case). The half-open probe is taken by an API
+    outside that set; the failing ones may probe only after a second
+    cooldown, so a site whose APIs all failed still recovers.
+    """
+
+    MIN_APIS = 2
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.failed_apis: set[str] = set()
+
+    def admits(self, now: float, api_name: str) -> bool:
+        if not self.can_pass(now):
+            return False
+        if self.state is CircuitState.CLOSED or api_name not in self.failed_apis:
+            return True
+        return now - self.opened_at >= 2 * self.cooldown
+
+    def record_success(self) -> None:
+        super().record_success()
+        self.failed_apis.clear()
+
+    def record_failure(self, now: float, api_name: str = "") -> None:
+        self.failed_apis.add(api_name)
+        if self.state is CircuitState.CLOSED and len(self.failed_apis) < self.MIN_APIS:
+            self.failures += 1
+            return
+        super().record_failure(now)
+
+
+class CircuitBreaker:
+    """Circuits per site and per API, consulted before every remote call.
+
+    A call passes only when both its site circuit and its API circuit admit
+    it. Unreachable-host failures (connection errors, timeouts) count
+    against both; other failures, 5xx included, only against the API.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 300.0,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._sites: dict[str, SiteCircuit] = {}
+        self._apis: dict[str, Circuit] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    def _options(self) -> dict[str, Any]:
+        return {
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "max_reset_timeout": self.max_reset_timeout,
+        }
+
+    def _site(self, site_key: str) -> SiteCircuit:
+        circuit = self._sites.get(site_key)
+        if circuit is None:
+            circuit = self._sites[site_key] = SiteCircuit(**self._options())
+        return circuit
+
+    def _api(self, api_name: str) -> Circuit:
+        circuit = self._apis.get(api_name)
+        if circuit is None:
+            circuit = self._apis[api_name] = Circuit(**self._options())
+        return circuit
+
+    def acquire(self, site_key: str, api_name: str) -> str | None:
+        """Admit a call; return the blocking reason when a circuit is open."""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        site = self._site(site_key)
+        api = self._api(api_name)
+        if not site.admits(now, api_name):
+            return f"circuit open: site {site_key}"
+        if not api.can_pass(now):
+            return f"circuit open: api {api_name}"
+        site.enter(now)
+        api.enter(now)
+        return None
+
+    def release(self, site_key: str, api_name: str) -> None:
+        for table, key in ((self._sites, site_key), (self._apis, api_name)):
+            circuit = table.get(key)
+            if circuit is not None:
+                circuit.release()
+
+    def record(
+        self,
+        site_key: str,
+        api_name: str,
+        *,
+        site_ok: bool,
+        api_ok: bool,
+    ) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        site = self._site(site_key)
+        if site_ok:
+            site.record_success()
+        else:
+            site.record_failure(now, api_name)
+        api = self._api(api_name)
+        if api_ok:
+            api.record_success()
+        else:
+            api.record_failure(now)
+
+    def get_states(self) -> dict[str, dict[str, dict[str, Any]]]:
+        now = time.monotonic()
+        return {
+            "sites": {key: c.snapshot(now) for key, c in self._sites.items()},
+            "apis": {key: c.snapshot(now) for key, c in self._apis.items()},
+        }
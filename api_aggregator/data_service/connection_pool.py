@@ -0,0 +1,123 @@
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, TCPConnector, TraceConfig
+
+from ..entry import SiteEntry
+from ..log import logger
+from ..model import ConnectorOptions
+
+
+@dataclass
+class ConnectionStats:
+    """Connection counters of one session, fed by aiohttp tracing."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["reuse_ratio"] = round(self.reuse_ratio, 4)
+        return data
+
+
+class ConnectionPool:
+    """Shared HTTP sessions with tuned connectors.
+
+    Every request goes through the default session unless its site overrides
+    connector options, in which case the site gets a dedicated session (and
+    connection pool) built from the defaults merged with its overrides.
+    """
+
+    DEFAULT_POOL = "default"
+
+    def __init__(self, options: ConnectorOptions | None = None) -> None:
+        self.options = ConnectorOptions(
+            max_connections=100,
+            max_connections_per_host=10,
+            keepalive_timeout=30.0,
+            dns_cache_ttl=300,
+        ).merged(options or ConnectorOptions())
+        self._sessions: dict[str, tuple[ConnectorOptions, ClientSession]] = {}
+        self._stats: dict[str, ConnectionStats] = {}
+        # Sessions replaced after a config change may still serve in-flight
+        # requests; they are only closed on shutdown.
+        self._retired: list[ClientSession] = []
+
+    def _build_trace_config(self, stats: ConnectionStats) -> TraceConfig:
+        async def on_request_start(session, ctx, params) -> None:
+            stats.requests += 1
+
+        async def on_connection_create_end(session, ctx, params) -> None:
+            stats.connections_created += 1
+
+        async def on_connection_reuseconn(session, ctx, params) -> None:
+            stats.connections_reused += 1
+
+        async def on_dns_cache_hit(session, ctx, params) -> None:
+            stats.dns_cache_hits += 1
+
+        async def on_dns_cache_miss(session, ctx, params) -> None:
+            stats.dns_cache_misses += 1
+
+        trace = TraceConfig(trace_config_ctx_factory=SimpleNamespace)
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    def _create_session(self, key: str, options: ConnectorOptions) -> ClientSession:
+        connector = TCPConnector(
+            limit=options.max_connections or 0,
+            limit_per_host=options.max_connections_per_host or 0,
+            keepalive_timeout=options.keepalive_timeout,
+            use_dns_cache=bool(options.dns_cache_ttl),
+            ttl_dns_cache=options.dns_cache_ttl or None,
+        )
+        stats = self._stats.setdefault(key, ConnectionStats())
+        return ClientSession(
+            connector=connector,
+            trace_configs=[self._build_trace_config(stats)],
+        )
+
+    async def session_for(self, site: SiteEntry | None = None) -> ClientSession:
+        """Session serving `site`; rebuilt when the site's overrides change."""
+        if site is None or site.connector.is_empty:
+            key, options = self.DEFAULT_POOL, self.options
+        else:
+            key, options = f"site:{site.name}", self.options.merged(site.connector)
+        current = self._sessions.get(key)
+        if current is not None:
+            current_options, session = current
+            if current_options == options and not session.closed:
+                return session
+            if not session.closed:
+                self._retired.append(session)
+            logger.debug("[remote] connection pool %s rebuilt", key)
+        session = self._create_session(key, options)
+        self._sessions[key] = (options, session)
+        return session
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-pool request, connection and DNS cache counters."""
+        return {key: stats.to_dict() for key, stats in self._stats.items()}
+
+    async def close(self) -> None:
+        sessions = [session for _, session in self._sessions.values()]
+        sessions.extend(self._retired)
+        self._sessions.clear()
+        self._retired.clear()
+        for session in sessions:
+            if not session.closed:
+                await session.close()
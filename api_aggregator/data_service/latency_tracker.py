@@ -0,0 +1,135 @@
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from ..log import logger
+
+
+class SiteLatency:
+    """Rolling window of request durations of one site."""
+
+    def __init__(self, window: int) -> None:
+        self.samples: deque[float] = deque(maxlen=window)
+        self.timeouts = 0
+        # Last derived (or persisted) timeout; None until one is known.
+        self.learned: float | None = None
+        self.dirty = False
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class LatencyTracker:
+    """Derives per-site request timeouts from observed latency.
+
+    Each site keeps its last `window` durations; once `min_samples` are in,
+    the effective timeout is `p99 * factor` clamped to `[min_timeout,
+    max_timeout]`. Timed-out requests are recorded at their timeout, so a
+    site that got slower pushes its timeout back up instead of failing
+    forever. Learned timeouts are handed to `persist` at most once per
+    `flush_interval` seconds and restored with `load` on startup.
+    """
+
+    def __init__(
+        self,
+        *,
+        factor: float = 3.0,
+        min_timeout: float = 3.0,
+        max_timeout: float = 120.0,
+        window: int = 200,
+        min_samples: int = 20,
+        persist: Callable[[list[dict[str, Any]]], None] | None = None,
+        flush_interval: float = 60.0,
+    ) -> None:
+        self.factor = factor
+        self.min_timeout = min_timeout
+        self.max_timeout = max(min_timeout, max_timeout)
+        self.window = window
+        self.min_samples = min_samples
+        self.persist = persist
+        self.flush_interval = flush_interval
+        self._sites: dict[str, SiteLatency] = {}
+        self._flushed_at = time.monotonic()
+
+    def _site(self, key: str) -> SiteLatency:
+        site = self._sites.get(key)
+        if site is None:
+            site = SiteLatency(self.window)
+            self._sites[key] = site
+        return site
+
+    def _clamp(self, seconds: float) -> float:
+        return min(self.max_timeout, max(self.min_timeout, seconds))
+
+    def record(self, key: str, seconds: float, *, timed_out: bool = False) -> None:
+        site = self._site(key)
+        site.samples.append(seconds)
+        if timed_out:
+            site.timeouts += 1
+        if len(site.samples) >= self.min_samples:
+            site.learned = self._clamp(site.percentile(0.99) * self.factor)
+            site.dirty = True
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def timeout_for(self, key: str, fallback: float) -> float:
+        """Learned timeout of `key`, or `fallback` while still learning."""
+        site = self._sites.get(key)
+        if site is None or site.learned is None:
+            return fallback
+        return site.learned
+
+    def load(self, rows: dict[str, dict[str, Any]]) -> None:
+        """Restore learned timeouts saved by a previous run."""
+        for key, row in rows.items():
+            timeout = row.get("timeout")
+            if isinstance(timeout, (int, float)) and timeout > 0:
+                self._site(key).learned = self._clamp(float(timeout))
+
+    def export(self, *, only_dirty: bool = True) -> list[dict[str, Any]]:
+        rows = []
+        for key, site in self._sites.items():
+            if site.learned is None or (only_dirty and not site.dirty):
+                continue
+            rows.append(
+                {
+                    "site": key,
+                    "timeout": round(site.learned, 3),
+                    "p50": round(site.percentile(0.5), 3),
+                    "p99": round(site.percentile(0.99), 3),
+                    "samples": len(site.samples),
+                }
+            )
+        return rows
+
+    def flush(self) -> None:
+        self._flushed_at = time.monotonic()
+        if self.persist is None:
+            return
+        rows = self.export()
+        if not rows:
+            return
+        try:
+            self.persist(rows)
+        except Exception as exc:
+            logger.warning(f"Persist site latency failed: {exc}")
+            return
+        for row in rows:
+            self._sites[row["site"]].dirty = False
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            key: {
+                "timeout": None if site.learned is None else round(site.learned, 3),
+                "p50": round(site.percentile(0.5), 3),
+                "p99": round(site.percentile(0.99), 3),
+                "samples": len(site.samples),
+                "timeouts": site.timeouts,
+            }
+            for key, site in self._sites.items()
+        }
@@ -0,0 +1,301 @@
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+# (hash, file, position, size, mtime); `file` is None for text records.
+CatalogItem = tuple[str | None, str | None, int | None, int, float]
+
+
+class LocalCatalog:
+    """SQLite catalog of local collections and their items.
+
+    One row per stored item with its content hash, file name (binaries) or
+    record position (text), size and mtime, so dedup checks, counts and
+    deletions are indexed queries. `collections.signature` records the
+    on-disk state (text file mtime/size, binary folder mtime) the rows were
+    last synced with; callers resync a collection when it differs. Each
+    collection row also carries a summary (count, size, latest mtime) that
+    is kept up to date with its items, for the dashboard listing.
+    """
+
+    def __init__(self, db_file: Path) -> None:
+        self.db_file = db_file
+        self._collection_ids: dict[tuple[str, str], int] = {}
+        self._conn: sqlite3.Connection | None = None
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Saves hit the catalog several times, so the connection is kept.
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.db_file))
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _init_schema(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS collections (
+                    id INTEGER PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    signature TEXT,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    size_bytes INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL DEFAULT 0,
+                    UNIQUE (type, name)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS items (
+                    id INTEGER PRIMARY KEY,
+                    collection_id INTEGER NOT NULL,
+                    hash TEXT,
+                    file TEXT,
+                    position INTEGER,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    mtime REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_items_hash
+                ON items (collection_id, hash)
+                """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_items_file
+                ON items (collection_id, file)
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS catalog_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+                """
+            )
+            conn.commit()
+
+    # ================== meta ==================
+
+    def get_meta(self, key: str) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM catalog_meta WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else str(row["value"])
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+            conn.commit()
+
+    # ================== collections ==================
+
+    def collection_id(self, data_type: str, name: str) -> int:
+        key = (data_type, name)
+        cid = self._collection_ids.get(key)
+        if cid is not None:
+            return cid
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO collections (type, name) VALUES (?, ?)", key
+            )
+            row = conn.execute(
+                "SELECT id FROM collections WHERE type = ? AND name = ?", key
+            ).fetchone()
+            conn.commit()
+        cid = int(row["id"])
+        self._collection_ids[key] = cid
+        return cid
+
+    def get_signature(self, cid: int) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT signature FROM collections WHERE id = ?", (cid,)
+            ).fetchone()
+        if row is None or row["signature"] is None:
+            return None
+        return str(row["signature"])
+
+    def drop_collection(self, data_type: str, name: str) -> None:
+        cid = self._collection_ids.pop((data_type, name), None)
+        with self._connect() as conn:
+            if cid is None:
+                row = conn.execute(
+                    "SELECT id FROM collections WHERE type = ? AND name = ?",
+                    (data_type, name),
+                ).fetchone()
+                cid = None if row is None else int(row["id"])
+            if cid is not None:
+                conn.execute("DELETE FROM items WHERE collection_id = ?", (cid,))
+                conn.execute("DELETE FROM collections WHERE id = ?", (cid,))
+            conn.commit()
+
+    def drop_missing(self, present: set[tuple[str, str]]) -> int:
+        """Drop collections that are no longer on disk."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id, type, name FROM collections").fetchall()
+            missing = [
+                row
+                for row in rows
+                if (str(row["type"]), str(row["name"])) not in present
+            ]
+            for row in missing:
+                self._collection_ids.pop((str(row["type"]), str(row["name"])), None)
+                conn.execute("DELETE FROM items WHERE collection_id = ?", (row["id"],))
+                conn.execute("DELETE FROM collections WHERE id = ?", (row["id"],))
+            conn.commit()
+        return len(missing)
+
+    def list_summaries(self) -> list[sqlite3.Row]:
+        """Summaries of all synced collections."""
+        with self._connect() as conn:
+            return conn.execute(
+                """
+                SELECT type, name, count, size_bytes, updated_at FROM collections
+                WHERE signature IS NOT NULL
+                """
+            ).fetchall()
+
+    @staticmethod
+    def _refresh_summary(conn: sqlite3.Connection, cid: int, signature: str) -> None:
+        conn.execute(
+            """
+            UPDATE collections SET
+                signature = ?,
+                count = (SELECT COUNT(*) FROM items WHERE collection_id = ?),
+                size_bytes = (
+                    SELECT COALESCE(SUM(size), 0) FROM items WHERE collection_id = ?
+                ),
+                updated_at = (
+                    SELECT COALESCE(MAX(mtime), 0) FROM items WHERE collection_id = ?
+                )
+            WHERE id = ?
+            """,
+            (signature, cid, cid, cid, cid),
+        )
+
+    # ================== items ==================
+
+    def find_hash(self, cid: int, content_hash: str) -> sqlite3.Row | None:
+        with self._connect() as conn:
+            return conn.execute(
+                """
+                SELECT file, position FROM items
+                WHERE collection_id = ? AND hash = ? LIMIT 1
+                """,
+                (cid, content_hash),
+            ).fetchone()
+
+    def add_item(self, cid: int, item: CatalogItem, *, signature: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO items (collection_id, hash, file, position, size, mtime)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (cid, *item),
+            )
+            conn.execute(
+                """
+                UPDATE collections SET
+                    signature = ?,
+                    count = count + 1,
+                    size_bytes = size_bytes + ?,
+                    updated_at = MAX(updated_at, ?)
+                WHERE id = ?
+                """,
+                (signature, item[3], item[4], cid),
+            )
+            conn.commit()
+
+    def replace_items(
+        self, cid: int, items: Iterable[CatalogItem], *, signature: str
+    ) -> None:
+        """Resync all rows of a collection with its on-disk state."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM items WHERE collection_id = ?", (cid,))
+            conn.executemany(
+                """
+                INSERT INTO items (collection_id, hash, file, position, size, mtime)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                ((cid, *item) for item in items),
+            )
+            self._refresh_summary(conn, cid, signature)
+            conn.commit()
+
+    def list_files(self, cid: int) -> list[sqlite3.Row]:
+        with self._connect() as conn:
+            return conn.execute(
+                """
+                SELECT hash, file, position, size, mtime FROM items
+                WHERE collection_id = ? AND file IS NOT NULL
+                ORDER BY position
+                """,
+                (cid,),
+            ).fetchall()
+
+    def add_files(
+        self,
+        cid: int,
+        items: Iterable[CatalogItem],
+        removed: Iterable[str],
+        *,
+        signature: str,
+    ) -> None:
+        """Apply a folder rescan: insert new files and drop vanished ones."""
+        with self._connect() as conn:
+            conn.executemany(
+                "DELETE FROM items WHERE collection_id = ? AND file = ?",
+                ((cid, name) for name in removed),
+            )
+            conn.executemany(
+                """
+                INSERT INTO items (collection_id, hash, file, position, size, mtime)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                ((cid, *item) for item in items),
+            )
+            self._refresh_summary(conn, cid, signature)
+            conn.commit()
+
+    def delete_files(self, cid: int, names: Iterable[str], *, signature: str) -> int:
+        with self._connect() as conn:
+            cursor = conn.executemany(
+                "DELETE FROM items WHERE collection_id = ? AND file = ?",
+                ((cid, name) for name in names),
+            )
+            self._refresh_summary(conn, cid, signature)
+            conn.commit()
+            return cursor.rowcount
+
+    def get_stats(self, cid: int) -> dict[str, Any]:
+        """Item count, total size and latest mtime of a collection."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT count, size_bytes, updated_at FROM collections WHERE id = ?",
+                (cid,),
+            ).fetchone()
+        if row is None:
+            return {"count": 0, "size_bytes": 0, "updated_at": 0}
+        return dict(row)
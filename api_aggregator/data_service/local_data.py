@@ -1,14 +1,20 @@
 import asyncio
 import hashlib
 import json
+import os
 import random
 import shutil
+import time
+from collections.abc import Callable, Generator
 from pathlib import Path
 from typing import Any
 
 from ...config import PluginConfig
 from ..log import logger
 from ..model import DataResource, DataType
+from .binary_manifest import BinaryManifest
+from .local_catalog import CatalogItem, LocalCatalog
+from .text_store import TextDataset
 
 
 class LocalDataError(Exception):
@@ -18,8 +24,11 @@ class LocalDataError(Exception):
 class LocalDataService:
     """Local data service for text/image/video/audio persistence."""
 
-    TEXT_INDEX_SUFFIX = ".index.json"
+    # Per-folder hash index of older versions, imported into the catalog.
     BINARY_INDEX_FILE = ".index.json"
+    CATALOG_FILE = "catalog.db"
+    # Collections resynced by `reconcile` between two event-loop yields.
+    RECONCILE_BATCH = 16
 
     def __init__(self, local_dir: Path) -> None:
         self.local_dir = local_dir
@@ -27,11 +36,118 @@ class LocalDataService:
         self.image_dir = self.local_dir / "image"
         self.video_dir = self.local_dir / "video"
         self.audio_dir = self.local_dir / "audio"
+        # Streamed downloads are staged outside the dataset folders so they
+        # do not touch the folder mtimes the binary manifests rely on.
+        self.partial_dir = self.local_dir / ".partial"
 
         self._dataset_locks: dict[tuple[str, str], asyncio.Lock] = {}
         self._locks_guard = asyncio.Lock()
+        self._text_datasets: dict[tuple[str, str], TextDataset] = {}
+        self._binary_manifests: dict[tuple[str, str], BinaryManifest] = {}
+        self._reconciler: asyncio.Task[None] | None = None
+        self.reconciled_at: float | None = None
 
         self._init_dirs()
+        self.catalog = LocalCatalog(self.local_dir / self.CATALOG_FILE)
+        self._migrate_legacy_indexes()
+
+    def start(self, reconcile_interval: float = 0.0) -> None:
+        """Reconcile in the background now, then every `reconcile_interval` s."""
+        if self._reconciler is None:
+            self._reconciler = asyncio.create_task(
+                self._reconcile_loop(reconcile_interval)
+            )
+
+    async def stop(self) -> None:
+        if self._reconciler is not None:
+            self._reconciler.cancel()
+            try:
+                await self._reconciler
+            except asyncio.CancelledError:
+                pass
+            self._reconciler = None
+        self.close()
+
+    def close(self) -> None:
+        """Close the catalog connection; it is reopened on next use."""
+        self.catalog.close()
+
+    async def _reconcile_loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as exc:
+                logger.warning(f"local catalog reconcile failed: {exc}")
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+    async def reconcile(self) -> int:
+        """Resync the catalog with datasets edited outside the plugin.
+
+        Costs one stat per collection; only collections whose file or folder
+        changed are rescanned, `RECONCILE_BATCH` at a time between yields to
+        the event loop. Returns the number of collections on disk.
+        """
+        steps = self._reconcile_steps()
+        while True:
+            try:
+                next(steps)
+            except StopIteration as done:
+                return done.value
+            await asyncio.sleep(0)
+
+    def _reconcile_steps(self) -> Generator[None, None, int]:
+        """`reconcile` as a generator that pauses after every batch."""
+        text_names = {
+            path.name[: -len(TextDataset.LEGACY_SUFFIX)]
+            for path in self.text_dir.glob(f"*{TextDataset.LEGACY_SUFFIX}")
+            if path.is_file()
+            and not path.name.endswith(TextDataset.LEGACY_INDEX_SUFFIX)
+        }
+        text_names.update(
+            path.stem for path in self.text_dir.glob(f"*{TextDataset.SUFFIX}")
+        )
+        present = {(DataType.TEXT.value, name) for name in text_names}
+        folders: list[tuple[DataType, Path]] = []
+        for data_type in (DataType.IMAGE, DataType.VIDEO, DataType.AUDIO):
+            for folder in self.get_type_dir(data_type).iterdir():
+                if folder.is_dir():
+                    folders.append((data_type, folder))
+                    present.add((data_type.value, folder.name))
+
+        # Drop vanished collections before pausing, so datasets created
+        # meanwhile are never mistaken for missing ones.
+        dropped = self.catalog.drop_missing(present)
+        for cache in (self._text_datasets, self._binary_manifests):
+            for key in [key for key in cache if key not in present]:
+                cache.pop(key)
+
+        synced = 0
+        for name in text_names:
+            dataset = self._text_dataset(DataType.TEXT, name)
+            if dataset.exists():
+                self._sync_text_catalog(DataType.TEXT, dataset)
+            synced += 1
+            if synced % self.RECONCILE_BATCH == 0:
+                yield
+        for data_type, folder in folders:
+            if not folder.is_dir():
+                continue
+            cid = self.catalog.collection_id(data_type.value, folder.name)
+            if self.catalog.get_signature(cid) != str(folder.stat().st_mtime_ns):
+                self._binary_manifest(data_type, folder.name)
+            synced += 1
+            if synced % self.RECONCILE_BATCH == 0:
+                yield
+
+        self.reconciled_at = time.time()
+        logger.debug(
+            "local catalog reconciled collections=%d, dropped=%d",
+            len(present),
+            dropped,
+        )
+        return len(present)
 
     def _init_dirs(self) -> None:
         for d in (
@@ -41,6 +157,8 @@ class LocalDataService:
             self.audio_dir,
         ):
             d.mkdir(parents=True, exist_ok=True)
+        # Leftovers of downloads interrupted by a restart.
+        shutil.rmtree(self.partial_dir, ignore_errors=True)
 
     def get_type_dir(self, data_type: DataType) -> Path:
         mapping = {
@@ -93,29 +211,6 @@ class LocalDataService:
     def _hash_binary(binary: bytes) -> str:
         return hashlib.sha256(binary).hexdigest()
 
-    @staticmethod
-    def _load_json_list(path: Path) -> list[Any]:
-        try:
-            raw = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            return []
-        return raw if isinstance(raw, list) else []
-
-    @staticmethod
-    def _write_json(path: Path, payload: Any) -> None:
-        path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=4),
-            encoding="utf-8",
-        )
-
-    @classmethod
-    def _is_text_data_file(cls, path: Path) -> bool:
-        return (
-            path.is_file()
-            and path.suffix == ".json"
-            and not path.name.endswith(cls.TEXT_INDEX_SUFFIX)
-        )
-
     @classmethod
     def _is_binary_data_file(cls, path: Path) -> bool:
         return (
@@ -124,50 +219,14 @@ class LocalDataService:
             and not path.name.startswith(".")
         )
 
-    def _text_data_file(self, data_type: DataType, name: str) -> Path:
-        return self.get_type_dir(data_type) / f"{name}{data_type.get_default_ext()}"
-
-    def _text_index_file(self, data_type: DataType, name: str) -> Path:
-        return self.get_type_dir(data_type) / f"{name}{self.TEXT_INDEX_SUFFIX}"
-
-    @staticmethod
-    def _text_file_signature(text_file: Path) -> tuple[int, int]:
-        stat = text_file.stat()
-        return int(stat.st_mtime_ns), int(stat.st_size)
-
-    def _load_text_hashes(
-        self, text_file: Path, index_file: Path, items: list[str]
-    ) -> set[str]:
-        current_mtime, current_size = self._text_file_signature(text_file)
-        try:
-            payload = json.loads(index_file.read_text(encoding="utf-8"))
-            hashes = payload.get("hashes", [])
-            source_mtime = int(payload.get("source_mtime_ns", -1))
-            source_size = int(payload.get("source_size", -1))
-            if (
-                isinstance(hashes, list)
-                and source_mtime == current_mtime
-                and source_size == current_size
-            ):
-                return {str(item) for item in hashes if str(item)}
-        except Exception:
-            pass
-
-        rebuilt = {self._hash_text(str(item)) for item in items}
-        self._save_text_hashes(text_file, index_file, rebuilt)
-        return rebuilt
-
-    def _save_text_hashes(
-        self, text_file: Path, index_file: Path, hashes: set[str]
-    ) -> None:
-        mtime_ns, size = self._text_file_signature(text_file)
-        payload = {
-            "version": 1,
-            "source_mtime_ns": mtime_ns,
-            "source_size": size,
-            "hashes": sorted(hashes),
-        }
-        self._write_json(index_file, payload)
+    def _text_dataset(self, data_type: DataType, name: str) -> TextDataset:
+        key = (data_type.value, name)
+        dataset = self._text_datasets.get(key)
+        if dataset is None:
+            dataset = TextDataset(self.get_type_dir(data_type), name)
+            self._text_datasets[key] = dataset
+        dataset.migrate_legacy()
+        return dataset
 
     @staticmethod
     def _load_binary_index(index_file: Path) -> dict[str, str]:
@@ -188,65 +247,109 @@ class LocalDataService:
                 result[hash_text] = file_text
         return result
 
-    def _save_binary_index(
-        self, index_file: Path, hash_to_file: dict[str, str]
-    ) -> None:
-        payload = {
-            "version": 1,
-            "hash_to_file": dict(
-                sorted(hash_to_file.items(), key=lambda item: item[0])
-            ),
-        }
-        self._write_json(index_file, payload)
-
-    def _list_binary_files(self, folder: Path) -> list[Path]:
-        return [p for p in folder.iterdir() if self._is_binary_data_file(p)]
+    def _binary_manifest(self, data_type: DataType, name: str) -> BinaryManifest:
+        key = (data_type.value, name)
+        manifest = self._binary_manifests.get(key)
+        if manifest is None:
+            manifest = BinaryManifest(
+                self.get_type_dir(data_type) / name, name, self._is_binary_data_file
+            )
+            self._binary_manifests[key] = manifest
+        if not manifest.is_current():
+            self._sync_binary_catalog(data_type, manifest)
+        return manifest
 
-    def _next_binary_sequence(self, folder: Path, dataset_name: str) -> int:
-        """
-        Find next sequence number for filenames like:
-        {dataset_name}_{seq}_{hash_prefix}.ext
-        """
-        prefix = f"{dataset_name}_"
-        max_seq = -1
-        for file in self._list_binary_files(folder):
-            stem = file.stem
-            if not stem.startswith(prefix):
-                continue
-            # stem example: name_12_ab12cd34
-            parts = stem[len(prefix) :].split("_", 1)
-            if not parts:
-                continue
-            try:
-                seq = int(parts[0])
-            except ValueError:
+    def _sync_binary_catalog(
+        self, data_type: DataType, manifest: BinaryManifest
+    ) -> None:
+        """Load a manifest from the catalog, rescanning the folder if it changed."""
+        cid = self.catalog.collection_id(data_type.value, manifest.dataset_name)
+        mtime = manifest.folder_mtime()
+        rows = self.catalog.list_files(cid)
+        if self.catalog.get_signature(cid) == str(mtime):
+            manifest.load([manifest.folder / str(row["file"]) for row in rows], mtime)
+            return
+
+        files = manifest.scan()
+        known = {str(row["file"]) for row in rows}
+        added: list[CatalogItem] = []
+        for file in files:
+            if file.name in known:
                 continue
-            if seq > max_seq:
-                max_seq = seq
-        return max_seq + 1
+            stat = file.stat()
+            # Files added outside the plugin are not hashed.
+            added.append(
+                (
+                    None,
+                    file.name,
+                    manifest.parse_seq(file.name),
+                    stat.st_size,
+                    stat.st_mtime,
+                )
+            )
+        removed = known - {file.name for file in files}
+        self.catalog.add_files(cid, added, removed, signature=str(mtime))
+        manifest.load(files, mtime)
+
+    def _sync_text_catalog(self, data_type: DataType, dataset: TextDataset) -> int:
+        """Catalog id of a text dataset, resynced when its file changed."""
+        cid = self.catalog.collection_id(data_type.value, dataset.name)
+        signature = dataset.signature()
+        if self.catalog.get_signature(cid) != signature:
+            mtime = dataset.data_file.stat().st_mtime if dataset.exists() else 0.0
+            items: list[CatalogItem] = []
+            for position, text in enumerate(dataset.read_all()):
+                size = len(dataset.encode(text))
+                items.append((self._hash_text(text), None, position, size, mtime))
+            self.catalog.replace_items(cid, items, signature=signature)
+        return cid
+
+    def _migrate_legacy_indexes(self) -> None:
+        """One-shot import of the per-collection JSON hash indexes."""
+        if self.catalog.get_meta("legacy_indexes_migrated"):
+            return
+        imported = 0
+        for data_type in (DataType.IMAGE, DataType.VIDEO, DataType.AUDIO):
+            for folder in self.get_type_dir(data_type).iterdir():
+                index_file = folder / self.BINARY_INDEX_FILE
+                if not folder.is_dir() or not index_file.is_file():
+                    continue
+                cid = self.catalog.collection_id(data_type.value, folder.name)
+                items: list[CatalogItem] = []
+                for content_hash, file_name in self._load_binary_index(
+                    index_file
+                ).items():
+                    path = folder / file_name
+                    if not path.is_file():
+                        continue
+                    stat = path.stat()
+                    items.append(
+                        (content_hash, file_name, None, stat.st_size, stat.st_mtime)
+                    )
+                # An empty signature makes the first access rescan the folder
+                # and pick up files the old index did not know about.
+                self.catalog.add_files(cid, items, (), signature="")
+                index_file.unlink()
+                imported += len(items)
+        self.catalog.set_meta("legacy_indexes_migrated", str(int(time.time())))
+        logger.info("local catalog migrated legacy indexes, items=%d", imported)
 
     def _save_text(self, data: DataResource) -> tuple[str, bool]:
         data.validate_for_save()
-        json_file = self._text_data_file(data.data_type, data.name)
-        index_file = self._text_index_file(data.data_type, data.name)
-
-        if not json_file.exists():
-            self._write_json(json_file, [])
-
-        items = [str(item) for item in self._load_json_list(json_file)]
-        hashes = self._load_text_hashes(json_file, index_file, items)
+        dataset = self._text_dataset(data.data_type, data.name)
+        cid = self._sync_text_catalog(data.data_type, dataset)
 
         saved_text = str(data.text or "").replace("\r", "\n")
         text_hash = self._hash_text(saved_text)
 
-        dedup_hit = text_hash in hashes
+        dedup_hit = self.catalog.find_hash(cid, text_hash) is not None
         if not dedup_hit:
-            items.append(saved_text)
-            self._write_json(json_file, items)
-            hashes.add(text_hash)
-            self._save_text_hashes(json_file, index_file, hashes)
-        elif not index_file.exists():
-            self._save_text_hashes(json_file, index_file, hashes)
+            position, size = dataset.append(saved_text)
+            self.catalog.add_item(
+                cid,
+                (text_hash, None, position, size, time.time()),
+                signature=dataset.signature(),
+            )
 
         logger.debug(
             "local text saved data_type=%s, name=%s, dedup=%s",
@@ -260,46 +363,111 @@ class LocalDataService:
     def _save_binary(self, data: DataResource) -> tuple[Path, bool]:
         if data.binary is None:
             raise LocalDataError("binary data is empty")
+        binary = data.binary
+        return self._store_binary(
+            data.data_type,
+            data.name,
+            self._hash_binary(binary),
+            len(binary),
+            write=lambda path: path.write_bytes(binary),
+        )
 
-        save_dir = self.get_type_dir(data.data_type) / data.name
+    def _store_binary(
+        self,
+        data_type: DataType,
+        name: str,
+        binary_hash: str,
+        size: int,
+        *,
+        write: Callable[[Path], Any],
+    ) -> tuple[Path, bool]:
+        """Dedup by content hash, else materialize the file via `write`."""
+        save_dir = self.get_type_dir(data_type) / name
         save_dir.mkdir(parents=True, exist_ok=True)
 
-        index_file = save_dir / self.BINARY_INDEX_FILE
-        hash_to_file = self._load_binary_index(index_file)
-        binary_hash = self._hash_binary(data.binary)
-        ext = data.data_type.get_default_ext()
+        manifest = self._binary_manifest(data_type, name)
+        cid = self.catalog.collection_id(data_type.value, name)
+        ext = data_type.get_default_ext()
 
-        existing_name = hash_to_file.get(binary_hash)
-        if existing_name:
-            existing_path = save_dir / existing_name
+        existing = self.catalog.find_hash(cid, binary_hash)
+        if existing is not None:
+            existing_path = save_dir / str(existing["file"])
             if existing_path.exists() and existing_path.is_file():
                 return existing_path, True
-            hash_to_file.pop(binary_hash, None)
+            self.catalog.delete_files(
+                cid, [existing_path.name], signature=str(manifest.mtime_ns)
+            )
 
-        seq = self._next_binary_sequence(save_dir, data.name)
+        seq = manifest.next_seq
         hash_prefix = binary_hash[:8]
-        file_name = f"{data.name}_{seq}_{hash_prefix}{ext}"
+        file_name = f"{name}_{seq}_{hash_prefix}{ext}"
         saved_path = save_dir / file_name
         while saved_path.exists():
             seq += 1
-            file_name = f"{data.name}_{seq}_{hash_prefix}{ext}"
+            file_name = f"{name}_{seq}_{hash_prefix}{ext}"
             saved_path = save_dir / file_name
 
-        dedup_hit = False
-        saved_path.write_bytes(data.binary)
+        write(saved_path)
 
-        hash_to_file[binary_hash] = file_name
-        self._save_binary_index(index_file, hash_to_file)
+        manifest.add(saved_path)
+        self.catalog.add_item(
+            cid,
+            (binary_hash, file_name, seq, size, time.time()),
+            signature=str(manifest.mtime_ns),
+        )
 
         logger.debug(
             "local file saved data_type=%s, path=%s, size=%s, hash=%s",
-            data.data_type,
+            data_type,
             saved_path,
-            len(data.binary),
+            size,
             binary_hash,
         )
 
-        return saved_path, dedup_hit
+        return saved_path, False
+
+    def get_download_dir(self, data_type: DataType, name: str) -> Path:
+        """Folder that streamed downloads of a dataset are staged in."""
+        return self.partial_dir / data_type.value
+
+    async def save_downloaded(
+        self,
+        data_type: DataType,
+        name: str,
+        temp_path: Path,
+        *,
+        content_hash: str,
+        size: int,
+    ) -> DataResource:
+        """Adopt a streamed download staged in `get_download_dir`.
+
+        The temp file is renamed into place (same filesystem, so the rename
+        is atomic) or deleted when its content hash is already stored.
+        """
+        if not data_type.is_binary:
+            raise LocalDataError(f"unsupported data type: {data_type}")
+        if size <= 0:
+            temp_path.unlink(missing_ok=True)
+            raise ValueError("Binary type requires binary")
+
+        lock = await self._get_dataset_lock(data_type, name)
+        async with lock:
+            try:
+                saved_path, is_duplicate = self._store_binary(
+                    data_type,
+                    name,
+                    content_hash,
+                    size,
+                    write=lambda path: os.replace(temp_path, path),
+                )
+            finally:
+                temp_path.unlink(missing_ok=True)
+        return DataResource(
+            data_type=data_type,
+            name=name,
+            saved_path=saved_path,
+            is_duplicate=is_duplicate,
+        )
 
     async def get_random_data(
         self,
@@ -311,8 +479,7 @@ class LocalDataService:
         """
 
         if data_type.is_text:
-            items = self._get_text(data_type, name)
-            text = random.choice(items)
+            text = self._get_random_text(data_type, name)
 
             logger.debug(f"local text loaded data_type={data_type}, name={name}")
 
@@ -323,8 +490,7 @@ class LocalDataService:
             )
 
         if data_type.is_binary:
-            files = self._get_binary(data_type, name)
-            path = random.choice(files).absolute()
+            path = self._get_binary(data_type, name).choice().absolute()
 
             logger.debug(f"local file loaded data_type={data_type}, path={path}")
 
@@ -336,35 +502,34 @@ class LocalDataService:
 
         raise LocalDataError(f"unsupported data type: {data_type}")
 
-    def _get_text(self, data_type: DataType, name: str) -> list[str]:
-        json_file = self._text_data_file(data_type, name)
+    def _get_random_text(self, data_type: DataType, name: str) -> str:
+        dataset = self._text_dataset(data_type, name)
 
-        if not json_file.exists():
-            raise LocalDataError(f"text dataset not found: {json_file}")
+        if not dataset.exists():
+            raise LocalDataError(f"text dataset not found: {dataset.data_file}")
+
+        count = dataset.count()
+        if count <= 0:
+            raise LocalDataError(f"text dataset empty: {dataset.data_file}")
 
         try:
-            items = json.loads(json_file.read_text(encoding="utf-8"))
-        except json.JSONDecodeError as exc:
+            return dataset.read_at(random.randrange(count))
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
             raise LocalDataError(
-                f"json parse failed: {json_file}, error: {exc}"
+                f"jsonl parse failed: {dataset.data_file}, error: {exc}"
             ) from exc
 
-        if not isinstance(items, list) or not items:
-            raise LocalDataError(f"text dataset empty or invalid: {json_file}")
-
-        return [str(item) for item in items]
-
-    def _get_binary(self, data_type: DataType, name: str) -> list[Path]:
+    def _get_binary(self, data_type: DataType, name: str) -> BinaryManifest:
         folder = self.get_type_dir(data_type) / name
 
         if not folder.exists():
             raise LocalDataError(f"folder not found: {folder}")
 
-        files = self._list_binary_files(folder)
-        if not files:
+        manifest = self._binary_manifest(data_type, name)
+        if not manifest.files:
             raise LocalDataError(f"folder empty: {folder}")
 
-        return files
+        return manifest
 
     # ================== management ==================
 
@@ -393,59 +558,37 @@ class LocalDataService:
     def _safe_int(value: int | float) -> int:
         return max(0, int(value))
 
-    def _build_text_summary(self, json_file: Path) -> dict[str, Any]:
-        try:
-            raw = json.loads(json_file.read_text(encoding="utf-8"))
-            items = raw if isinstance(raw, list) else []
-        except Exception:
-            items = []
-
-        stat = json_file.stat()
-        return {
-            "type": DataType.TEXT.value,
-            "name": json_file.stem,
-            "count": len(items),
-            "size_bytes": self._safe_int(stat.st_size),
-            "updated_at": self._safe_int(stat.st_mtime),
-            "path": self._relative_path_text(json_file),
-        }
-
-    def _build_binary_summary(
-        self, data_type: DataType, folder: Path
-    ) -> dict[str, Any]:
-        files = self._list_binary_files(folder)
-        total_size = 0
-        updated_at = 0
-
-        for file in files:
-            stat = file.stat()
-            total_size += self._safe_int(stat.st_size)
-            updated_at = max(updated_at, self._safe_int(stat.st_mtime))
-
+    def _build_summary(self, row: Any) -> dict[str, Any]:
+        data_type = DataType.from_str(str(row["type"]))
+        name = str(row["name"])
+        # Type dirs sit right under `local_dir`; avoid Path work per row.
+        path = f"{self.get_type_dir(data_type).name}/{name}"
+        if data_type.is_text:
+            path += TextDataset.SUFFIX
         return {
             "type": data_type.value,
-            "name": folder.name,
-            "count": len(files),
-            "size_bytes": total_size,
-            "updated_at": updated_at,
-            "path": self._relative_path_text(folder),
+            "name": name,
+            "count": int(row["count"]),
+            "size_bytes": self._safe_int(row["size_bytes"]),
+            "updated_at": self._safe_int(row["updated_at"]),
+            "path": path,
         }
 
-    def list_collections(self) -> list[dict[str, Any]]:
-        collections: list[dict[str, Any]] = []
-
-        for json_file in sorted(
-            self.text_dir.glob("*.json"), key=lambda p: p.name.lower()
-        ):
-            if self._is_text_data_file(json_file):
-                collections.append(self._build_text_summary(json_file))
-
-        for data_type in (DataType.IMAGE, DataType.VIDEO, DataType.AUDIO):
-            type_dir = self.get_type_dir(data_type)
-            for folder in sorted(type_dir.iterdir(), key=lambda p: p.name.lower()):
-                if folder.is_dir():
-                    collections.append(self._build_binary_summary(data_type, folder))
+    def _collection_summary(self, data_type: DataType, name: str) -> dict[str, Any]:
+        cid = self.catalog.collection_id(data_type.value, name)
+        return self._build_summary(
+            {"type": data_type.value, "name": name, **self.catalog.get_stats(cid)}
+        )
 
+    def list_collections(self) -> list[dict[str, Any]]:
+        """Collection summaries from the catalog; no per-file work."""
+        if self.reconciled_at is None:
+            # Not reconciled in the background yet: do it inline, once.
+            for _ in self._reconcile_steps():
+                pass
+        collections = [
+            self._build_summary(row) for row in self.catalog.list_summaries()
+        ]
         collections.sort(
             key=lambda item: (
                 str(item.get("type", "")),
@@ -609,23 +752,23 @@ class LocalDataService:
         self, data_type: DataType, name: str
     ) -> dict[str, Any]:
         if data_type.is_text:
-            json_file = self._text_data_file(data_type, name)
-            if not json_file.exists():
-                raise LocalDataError(f"text dataset not found: {json_file}")
+            dataset = self._text_dataset(data_type, name)
+            if not dataset.exists():
+                raise LocalDataError(f"text dataset not found: {dataset.data_file}")
 
             try:
-                raw = json.loads(json_file.read_text(encoding="utf-8"))
-                items = raw if isinstance(raw, list) else []
+                items = dataset.read_all()
             except Exception as exc:
                 raise LocalDataError(
-                    f"json parse failed: {json_file}, error: {exc}"
+                    f"jsonl parse failed: {dataset.data_file}, error: {exc}"
                 ) from exc
 
-            summary = self._build_text_summary(json_file)
+            self._sync_text_catalog(data_type, dataset)
+            summary = self._collection_summary(data_type, name)
             summary["items"] = [
                 {
                     "index": idx,
-                    "text": str(item),
+                    "text": item,
                 }
                 for idx, item in enumerate(items)
             ]
@@ -635,18 +778,20 @@ class LocalDataService:
         if not folder.exists() or not folder.is_dir():
             raise LocalDataError(f"folder not found: {folder}")
 
-        files = self._list_binary_files(folder)
-        files.sort(key=lambda p: p.name.lower())
-
-        summary = self._build_binary_summary(data_type, folder)
+        self._binary_manifest(data_type, name)
+        summary = self._collection_summary(data_type, name)
+        rows = self.catalog.list_files(
+            self.catalog.collection_id(data_type.value, name)
+        )
+        rows.sort(key=lambda row: str(row["file"]).lower())
         summary["items"] = [
             {
-                "name": file.name,
-                "path": self._relative_path_text(file),
-                "size_bytes": self._safe_int(file.stat().st_size),
-                "updated_at": self._safe_int(file.stat().st_mtime),
+                "name": str(row["file"]),
+                "path": self._relative_path_text(folder / str(row["file"])),
+                "size_bytes": self._safe_int(row["size"]),
+                "updated_at": self._safe_int(row["mtime"]),
             }
-            for file in files
+            for row in rows
         ]
         return summary
 
@@ -692,20 +837,21 @@ class LocalDataService:
 
     def _delete_collection_one(self, data_type: DataType, name: str) -> dict[str, Any]:
         if data_type.is_text:
-            json_file = self._text_data_file(data_type, name)
-            index_file = self._text_index_file(data_type, name)
-            if not json_file.exists():
-                raise LocalDataError(f"text dataset not found: {json_file}")
-            json_file.unlink()
-            if index_file.exists():
-                index_file.unlink()
+            dataset = self._text_dataset(data_type, name)
+            if not dataset.exists():
+                raise LocalDataError(f"text dataset not found: {dataset.data_file}")
+            dataset.delete()
+            self._text_datasets.pop((data_type.value, name), None)
+            self.catalog.drop_collection(data_type.value, name)
             return {"deleted": 1}
 
         folder = self.get_type_dir(data_type) / name
         if not folder.exists() or not folder.is_dir():
             raise LocalDataError(f"folder not found: {folder}")
-        deleted = len(self._list_binary_files(folder))
+        deleted = len(self._binary_manifest(data_type, name).files)
         shutil.rmtree(folder)
+        self._binary_manifests.pop((data_type.value, name), None)
+        self.catalog.drop_collection(data_type.value, name)
         return {"deleted": deleted}
 
     def delete_collections_batch(self, targets: list[dict[str, Any]]) -> dict[str, Any]:
@@ -754,19 +900,17 @@ class LocalDataService:
             raise LocalDataError("items must be a non-empty list")
 
         if data_type.is_text:
-            json_file = self._text_data_file(data_type, name)
-            index_file = self._text_index_file(data_type, name)
-            if not json_file.exists():
-                raise LocalDataError(f"text dataset not found: {json_file}")
+            dataset = self._text_dataset(data_type, name)
+            if not dataset.exists():
+                raise LocalDataError(f"text dataset not found: {dataset.data_file}")
 
             try:
-                raw = json.loads(json_file.read_text(encoding="utf-8"))
+                dataset_items = dataset.read_all()
             except Exception as exc:
                 raise LocalDataError(
-                    f"json parse failed: {json_file}, error: {exc}"
+                    f"jsonl parse failed: {dataset.data_file}, error: {exc}"
                 ) from exc
 
-            dataset_items = list(raw) if isinstance(raw, list) else []
             unique_indices: set[int] = set()
             for item in items:
                 if not isinstance(item, dict):
@@ -796,9 +940,8 @@ class LocalDataService:
             if removed_count <= 0:
                 raise LocalDataError("no valid items to delete")
 
-            self._write_json(json_file, dataset_items)
-            rebuilt_hashes = {self._hash_text(str(item)) for item in dataset_items}
-            self._save_text_hashes(json_file, index_file, rebuilt_hashes)
+            dataset.rewrite(dataset_items)
+            self._sync_text_catalog(data_type, dataset)
 
             return {
                 "deleted": removed_count,
@@ -836,34 +979,23 @@ class LocalDataService:
         if not targets:
             raise LocalDataError("binary type requires at least one valid path")
 
+        manifest = self._binary_manifest(data_type, name)
         for target in targets.values():
             target.unlink()
+        manifest.remove(targets)
+        self.catalog.delete_files(
+            self.catalog.collection_id(data_type.value, name),
+            targets,
+            signature=str(manifest.mtime_ns),
+        )
 
         deleted_count = len(targets)
-        index_file = expected_folder / self.BINARY_INDEX_FILE
-        if index_file.exists():
-            hash_to_file = self._load_binary_index(index_file)
-            changed = False
-            for content_hash, file_name in list(hash_to_file.items()):
-                if file_name in targets:
-                    hash_to_file.pop(content_hash, None)
-                    changed = True
-            if changed:
-                if hash_to_file:
-                    self._save_binary_index(index_file, hash_to_file)
-                else:
-                    index_file.unlink()
-
-        if not self._list_binary_files(expected_folder):
-            if index_file.exists():
-                index_file.unlink()
+        remain = len(manifest.files)
+        if not remain:
+            (expected_folder / self.BINARY_INDEX_FILE).unlink(missing_ok=True)
             expected_folder.rmdir()
-
-        remain = (
-            len(self._list_binary_files(expected_folder))
-            if expected_folder.exists()
-            else 0
-        )
+            self._binary_manifests.pop((data_type.value, name), None)
+            self.catalog.drop_collection(data_type.value, name)
         return {
             "deleted": deleted_count,
             "failed": failed_count,
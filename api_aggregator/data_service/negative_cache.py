@@ -0,0 +1,67 @@
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any
+
+from ..entry import APIEntry
+
+NegativeKey = tuple[str, str, str, str]
+
+
+class NegativeCache:
+    """Short-lived memory of requests that failed with a business error.
+
+    Only responses that arrived fine but were judged invalid by
+    `RequestResult.is_valid` (e.g. `{"code": 500, "msg": "invalid id"}`) are
+    remembered; transport errors are left to the circuit breaker. Repeats of
+    the same entry and effective params within `ttl` seconds get the cached
+    error without a round trip.
+    """
+
+    def __init__(self, ttl: float = 60.0, capacity: int = 1024) -> None:
+        self.ttl = ttl
+        self.capacity = capacity
+        self._entries: OrderedDict[NegativeKey, tuple[float, int | None, str]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def make_key(entry: APIEntry, params: Mapping[str, Any]) -> NegativeKey:
+        return (
+            entry.name,
+            entry.url,
+            entry.parse,
+            json.dumps(dict(params), ensure_ascii=False, sort_keys=True, default=str),
+        )
+
+    def get(self, key: NegativeKey) -> tuple[int | None, str] | None:
+        """Cached `(status, error)` of `key`, if it has not expired."""
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        expires_at, status, error = cached
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self.hits += 1
+        return status, error
+
+    def put(self, key: NegativeKey, status: int | None, error: str) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, status, error)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: NegativeKey) -> None:
+        self._entries.pop(key, None)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits}
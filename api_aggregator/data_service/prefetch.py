@@ -0,0 +1,195 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from ..entry import APIEntry, APIEntryManager, APIRequestContext
+from ..log import logger
+from ..model import DataResource
+
+
+class PrefetchBuffer:
+    """Keeps ready-to-send items of hot APIs downloaded ahead of time.
+
+    An API is hot when it is listed in `names`, or when it was fetched at
+    least `hot_threshold` times within the last `hot_window` seconds. A
+    background worker keeps up to `depth` saved items per hot API, bounded by
+    `max_bytes` over all buffers and `site_concurrency` refills per site.
+    Only plain requests, whose runtime params leave the entry's static params
+    unchanged, are served from the buffer.
+    """
+
+    def __init__(
+        self,
+        api_mgr: APIEntryManager,
+        fetch: Callable[[APIRequestContext], Awaitable[DataResource | None]],
+        *,
+        site_key: Callable[[APIEntry], str],
+        depth: int = 3,
+        names: Iterable[str] = (),
+        hot_threshold: int = 0,
+        hot_window: float = 600.0,
+        max_bytes: int = 200 * 1024 * 1024,
+        site_concurrency: int = 1,
+        interval: float = 30.0,
+    ) -> None:
+        self.api_mgr = api_mgr
+        self.fetch = fetch
+        self.site_key = site_key
+        self.depth = depth
+        self.names = set(names)
+        self.hot_threshold = hot_threshold
+        self.hot_window = hot_window
+        self.max_bytes = max_bytes
+        self.site_concurrency = max(1, site_concurrency)
+        self.interval = interval
+
+        self._buffers: dict[str, deque[tuple[DataResource, int]]] = {}
+        self._usage: dict[str, deque[float]] = {}
+        self._site_slots: dict[str, asyncio.Semaphore] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._wake = asyncio.Event()
+        self._worker: asyncio.Task[None] | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.depth > 0 and (bool(self.names) or self.hot_threshold > 0)
+
+    def start(self) -> None:
+        if self.enabled and self._worker is None:
+            self._wake.set()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self, *, discard: bool = False) -> None:
+        """Stop the worker; `discard` also deletes the buffered files."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if discard:
+            for buffer in self._buffers.values():
+                for data, _ in buffer:
+                    data.unlink()
+        self._buffers.clear()
+        self._bytes = 0
+
+    @staticmethod
+    def _is_eligible(entry: APIEntry) -> bool:
+        # Cached text APIs are served by the response cache instead.
+        return entry.enabled and (entry.data_type.is_binary or entry.cache.is_empty)
+
+    def _is_hot(self, name: str, now: float) -> bool:
+        if name in self.names:
+            return True
+        if self.hot_threshold <= 0:
+            return False
+        usage = self._usage.get(name)
+        if not usage:
+            return False
+        while usage and now - usage[0] > self.hot_window:
+            usage.popleft()
+        return len(usage) >= self.hot_threshold
+
+    def _note_usage(self, name: str, now: float) -> None:
+        if self.hot_threshold <= 0:
+            return
+        usage = self._usage.setdefault(name, deque(maxlen=self.hot_threshold))
+        usage.append(now)
+
+    @staticmethod
+    def _is_plain(request: APIRequestContext) -> bool:
+        # Callers pass the static params back when the user gave no args.
+        static = request.entry.params or {}
+        return all(
+            key in static and static[key] == value
+            for key, value in request.updated_params.items()
+        )
+
+    def pop(self, request: APIRequestContext) -> DataResource | None:
+        """Take a buffered item for `request` and schedule a refill."""
+        if not self.enabled or not self._is_plain(request):
+            return None
+        entry = request.entry
+        now = time.monotonic()
+        self._note_usage(entry.name, now)
+        buffer = self._buffers.get(entry.name)
+        data = None
+        while buffer:
+            candidate, size = buffer.popleft()
+            self._bytes -= size
+            # Items deleted from the dataset meanwhile are dropped.
+            if candidate.saved_path is None or candidate.saved_path.exists():
+                data = candidate
+                break
+        if data is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        if self._is_hot(entry.name, now) and self._is_eligible(entry):
+            self._wake.set()
+        return data
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            try:
+                await self._refill_all()
+            except Exception as exc:
+                logger.warning(f"Prefetch refill failed: {exc}")
+
+    async def _refill_all(self) -> None:
+        now = time.monotonic()
+        hot = [
+            entry
+            for entry in self.api_mgr.list_entries()
+            if self._is_hot(entry.name, now) and self._is_eligible(entry)
+        ]
+        hot_names = {entry.name for entry in hot}
+        for name in list(self._buffers):
+            if name not in hot_names:
+                # No longer hot (or removed): keep serving what is left.
+                if not self._buffers[name]:
+                    self._buffers.pop(name)
+        await asyncio.gather(*(self._refill(entry) for entry in hot))
+
+    async def _refill(self, entry: APIEntry) -> None:
+        buffer = self._buffers.setdefault(entry.name, deque())
+        key = self.site_key(entry)
+        slot = self._site_slots.get(key)
+        if slot is None:
+            slot = asyncio.Semaphore(self.site_concurrency)
+            self._site_slots[key] = slot
+        while len(buffer) < self.depth and self._bytes < self.max_bytes:
+            async with slot:
+                data = await self.fetch(APIRequestContext(entry))
+            if data is None:
+                # Upstream is failing; try again after `interval`.
+                asyncio.get_running_loop().call_later(self.interval, self._wake.set)
+                return
+            size = self._size_of(data)
+            buffer.append((data, size))
+            self._bytes += size
+
+    @staticmethod
+    def _size_of(data: DataResource) -> int:
+        if data.saved_path is not None:
+            try:
+                return data.saved_path.stat().st_size
+            except OSError:
+                return 0
+        return len((data.final_text or "").encode("utf-8"))
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "buffered": {name: len(items) for name, items in self._buffers.items()},
+            "bytes": self._bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
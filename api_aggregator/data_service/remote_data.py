@@ -1,13 +1,30 @@
 import asyncio
+import codecs
+import hashlib
+import time
+import uuid
+import weakref
 from collections import defaultdict
-from collections.abc import AsyncIterator, Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from pathlib import Path
 from typing import Any
 
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientResponse, ClientSession, ClientTimeout
 
-from ..entry import APIEntry, APIEntryManager, SiteEntryManager
+from ..entry import APIEntry, APIEntryManager, APIRequestContext, SiteEntryManager
 from ..log import logger
+from ..model import ConnectorOptions, DataType, SiteLimitOptions
+from .circuit_breaker import CircuitBreaker
+from .connection_pool import ConnectionPool
+from .latency_tracker import LatencyTracker
+from .negative_cache import NegativeCache
 from .request_result import RequestResult
+from .request_template import RequestTemplate
+from .site_scheduler import SiteBusyError, SiteScheduler
+
+
+class ResponseTooLargeError(Exception):
+    """Raised when a response exceeds the size cap of its entry."""
 
 
 class RemoteDataService:
@@ -15,11 +32,40 @@ class RemoteDataService:
         self,
         api_mgr: APIEntryManager,
         site_mgr: SiteEntryManager,
+        connector: ConnectorOptions | None = None,
+        limits: SiteLimitOptions | None = None,
+        queue_timeout: float | None = 3.0,
+        max_response_bytes: Mapping[DataType, int] | None = None,
+        hedge_width: int = 3,
+        link_timeout: float = 10.0,
+        breaker_threshold: int = 3,
+        breaker_cooldown: float = 30.0,
+        timeout_factor: float = 3.0,
+        timeout_bounds: tuple[float, float] = (3.0, 120.0),
+        save_latency: Callable[[list[dict[str, Any]]], None] | None = None,
+        negative_ttl: float = 60.0,
     ) -> None:
         self.api_mgr = api_mgr
         self.site_mgr = site_mgr
 
-        self.session: ClientSession | None = None
+        self.connections = ConnectionPool(connector)
+        self.scheduler = SiteScheduler(limits, queue_timeout=queue_timeout)
+        # Reopened circuits back off up to ten times the base cooldown.
+        self.breaker = CircuitBreaker(
+            failure_threshold=breaker_threshold,
+            reset_timeout=breaker_cooldown,
+            max_reset_timeout=breaker_cooldown * 10,
+        )
+        # Per-site timeouts learned from latency; a factor of 0 keeps the
+        # static site timeouts.
+        self.timeout_factor = timeout_factor
+        self.latency = LatencyTracker(
+            factor=timeout_factor,
+            min_timeout=timeout_bounds[0],
+            max_timeout=timeout_bounds[1],
+            persist=save_latency,
+        )
+        self.negative = NegativeCache(negative_ttl)
 
         self.default_headers = {
             "User-Agent": (
@@ -30,82 +76,279 @@ class RemoteDataService:
             "Accept": "*/*",
         }
         self.default_request_timeout = 60
-        # Batch test pacing: sequential per site, parallel across sites.
-        self.batch_site_interval_seconds = 0.2
+        self.download_chunk_size = 64 * 1024
+        # Per data type response size caps in bytes; 0 means unlimited.
+        self.max_response_bytes: dict[DataType, int] = dict(max_response_bytes or {})
+        # Extracted media links: how many are raced at once, and how long an
+        # attempt may wait to connect or between reads (0 falls back to the
+        # site timeout). The body transfer stays bounded by the site timeout.
+        self.hedge_width = hedge_width
+        self.link_timeout = link_timeout
+        # Entries are immutable and replaced on change, so keying by the entry
+        # object drops templates of edited/removed entries automatically.
+        self._templates: weakref.WeakKeyDictionary[APIEntry, RequestTemplate] = (
+            weakref.WeakKeyDictionary()
+        )
 
     async def close(self):
-        if self.session is not None and not self.session.closed:
-            await self.session.close()
-        self.session = None
-
-    async def _ensure_session(self) -> ClientSession:
-        if self.session is None or self.session.closed:
-            self.session = ClientSession()
-        return self.session
-
-    def _build_request_args(self, entry: APIEntry):
-        site = self.site_mgr.match_entry(entry.url)
-        headers = site.get_headers() if site else self.default_headers.copy()
-        keys = site.get_keys() if site else None
-        params = dict(entry.params or {})
-        params.update(dict(entry.updated_params or {}))
-        timeout = site.timeout if site else self.default_request_timeout
-
-        if keys:
-            headers.update(keys)
-            params.update(keys)
-
-        return headers, params, timeout
+        self.latency.flush()
+        await self.connections.close()
+
+    async def _ensure_session(
+        self, template: RequestTemplate | None = None
+    ) -> ClientSession:
+        site = template.site if template else None
+        return await self.connections.session_for(site)
+
+    def get_connection_stats(self) -> dict[str, dict[str, Any]]:
+        return self.connections.get_stats()
+
+    def get_scheduler_stats(self) -> dict[str, dict[str, Any]]:
+        return self.scheduler.get_stats()
+
+    def get_circuit_states(self) -> dict[str, dict[str, dict[str, Any]]]:
+        return self.breaker.get_states()
+
+    def get_latency_stats(self) -> dict[str, dict[str, Any]]:
+        return self.latency.get_stats()
+
+    def get_negative_cache_stats(self) -> dict[str, Any]:
+        return self.negative.get_stats()
+
+    def get_template(self, entry: APIEntry) -> RequestTemplate:
+        """Cached request template of `entry`, rebuilt when its site pool changes."""
+        site_generation = self.site_mgr.snapshot.generation
+        template = self._templates.get(entry)
+        if template is None or template.site_generation != site_generation:
+            template = RequestTemplate.build(
+                entry,
+                self.site_mgr.match_entry(entry.url),
+                site_generation=site_generation,
+                default_headers=self.default_headers,
+                default_timeout=self.default_request_timeout,
+                default_max_bytes=self.max_response_bytes.get(entry.data_type, 0),
+            )
+            self._templates[entry] = template
+        return template
 
     async def _request(
         self,
         url: str,
         *,
-        headers: dict[str, Any],
-        params: dict[str, Any],
-        timeout: int = 60,
+        headers: Mapping[str, Any],
+        params: Mapping[str, Any],
+        timeout: ClientTimeout | int = 60,
+        session: ClientSession | None = None,
+        download_dir: Path | None = None,
+        max_bytes: int = 0,
     ) -> RequestResult:
         result = RequestResult()
 
         try:
-            session = await self._ensure_session()
+            session = session or await self._ensure_session()
             async with session.get(
                 url,
                 headers=headers,
                 params=params,
-                timeout=ClientTimeout(timeout),
+                timeout=(
+                    timeout
+                    if isinstance(timeout, ClientTimeout)
+                    else ClientTimeout(timeout)
+                ),
             ) as resp:
+                result.status = resp.status
                 resp.raise_for_status()
 
-                result.status = resp.status
                 result.content_type = resp.headers.get("Content-Type", "").lower()
                 result.final_url = str(resp.url)
 
+                length = resp.content_length
+                if max_bytes and length is not None and length > max_bytes:
+                    raise ResponseTooLargeError(
+                        f"Response too large: Content-Length {length} bytes "
+                        f"exceeds limit {max_bytes} bytes"
+                    )
+
                 if "application/json" in result.content_type:
-                    result.raw_text = await resp.text()
+                    body = await self._read_body(resp, max_bytes)
+                    result.raw_text = body.decode(self._text_encoding(resp))
                     return result
 
                 if "text/" in result.content_type:
-                    result.raw_text = (await resp.text()).strip()
+                    body = await self._read_body(resp, max_bytes)
+                    result.raw_text = body.decode(self._text_encoding(resp)).strip()
                     return result
 
-                result.raw_content = await resp.read()
+                if download_dir is not None:
+                    await self._stream_to_file(resp, result, download_dir, max_bytes)
+                    return result
+
+                result.raw_content = await self._read_body(resp, max_bytes)
                 return result
 
+        except asyncio.TimeoutError:
+            logger.error(f"Request timed out {url}")
+            result.error = "Request timed out"
+            result.timed_out = True
+            return result
+        except ResponseTooLargeError as e:
+            logger.warning(f"Request aborted {url}: {e}")
+            result.error = str(e)
+            return result
         except Exception as e:
             logger.error(f"Request failed {url}: {e}")
             result.error = str(e)
             return result
 
-    async def get_data(self, entry: APIEntry) -> RequestResult:
-        headers, params, timeout = self._build_request_args(entry)
+    @staticmethod
+    def _text_encoding(resp: ClientResponse) -> str:
+        # Same resolution as `ClientResponse.text()` with the default
+        # fallback resolver, without requiring `read()` first.
+        if resp.charset:
+            try:
+                return codecs.lookup(resp.charset).name
+            except LookupError:
+                pass
+        return "utf-8"
+
+    @staticmethod
+    def _too_large(max_bytes: int) -> ResponseTooLargeError:
+        return ResponseTooLargeError(
+            f"Response too large: exceeded limit {max_bytes} bytes while reading"
+        )
+
+    async def _read_body(self, resp: ClientResponse, max_bytes: int) -> bytes:
+        """Read the body, aborting as soon as it grows past `max_bytes`."""
+        if not max_bytes:
+            return await resp.read()
+        body = bytearray()
+        async for chunk in resp.content.iter_chunked(self.download_chunk_size):
+            body.extend(chunk)
+            if len(body) > max_bytes:
+                raise self._too_large(max_bytes)
+        return bytes(body)
+
+    async def _stream_to_file(
+        self,
+        resp: ClientResponse,
+        result: RequestResult,
+        download_dir: Path,
+        max_bytes: int = 0,
+    ) -> None:
+        """Write the body to a hidden temp file, hashing it chunk by chunk."""
+        download_dir.mkdir(parents=True, exist_ok=True)
+        path = download_dir / f".{uuid.uuid4().hex}.part"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with path.open("wb") as fp:
+                async for chunk in resp.content.iter_chunked(self.download_chunk_size):
+                    size += len(chunk)
+                    if max_bytes and size > max_bytes:
+                        raise self._too_large(max_bytes)
+                    fp.write(chunk)
+                    digest.update(chunk)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        result.file_path = path
+        result.file_hash = digest.hexdigest()
+        result.file_size = size
+
+    async def get_data(
+        self,
+        request: APIRequestContext,
+        *,
+        block: bool = False,
+        download_dir: Path | None = None,
+        short_circuit: bool = True,
+    ) -> RequestResult:
+        """Fetch one API through its circuit breaker and its site's scheduler.
+
+        While the site or API circuit is open, when the same entry and params
+        recently failed with a business error, or when the site has no free
+        slot or token within the queue timeout, the result carries an error
+        right away so callers can fall back to local data. `block` waits for
+        the site as long as needed; `short_circuit=False` ignores open circuits
+        and the negative cache but still records the outcome (used by batch
+        tests and previews).
+
+        With `download_dir`, binary bodies are streamed into a temp file there
+        (see `RequestResult.file_path`) instead of being read into memory; the
+        caller owns that file.
+        """
+        template = self.get_template(request.entry)
+        site_key, api_name = template.site_key, request.entry.name
+        negative_key = None
+        if self.negative.enabled:
+            negative_key = NegativeCache.make_key(
+                request.entry, template.build_params(request)
+            )
+            cached = self.negative.get(negative_key) if short_circuit else None
+            if cached is not None:
+                status, error = cached
+                logger.debug(f"Request skipped {request.entry.url}: cached {error}")
+                return RequestResult(status=status, error=error, business_error=True)
+        if short_circuit:
+            reason = self.breaker.acquire(site_key, api_name)
+            if reason:
+                logger.debug(f"Request skipped {request.entry.url}: {reason}")
+                return RequestResult(error=reason)
+        try:
+            async with self.scheduler.acquire(site_key, template.site, block=block):
+                result = await self._fetch(request, template, download_dir)
+        except SiteBusyError as exc:
+            logger.warning(f"Request skipped {request.entry.url}: {exc}")
+            self.breaker.release(site_key, api_name)
+            return RequestResult(error=str(exc))
+        except BaseException:
+            self.breaker.release(site_key, api_name)
+            raise
+        site_ok, api_ok = self._classify(result)
+        self.breaker.record(site_key, api_name, site_ok=site_ok, api_ok=api_ok)
+        if negative_key is not None:
+            if result.business_error:
+                self.negative.put(negative_key, result.status, result.error or "")
+            elif result.ok:
+                self.negative.discard(negative_key)
+        return result
+
+    @staticmethod
+    def _classify(result: RequestResult) -> tuple[bool, bool]:
+        """(site healthy, API healthy) as seen by the circuit breaker.
 
+        Only a missing status (connection error, timeout) is a site failure;
+        a 5xx means the host answered, so like any other bad result it only
+        counts against the API. Business errors are left to the negative
+        cache: they usually come from bad params, and the API itself answered.
+        """
+        if result.ok or result.business_error:
+            return True, True
+        return result.status is not None, False
+
+    async def _fetch(
+        self,
+        request: APIRequestContext,
+        template: RequestTemplate,
+        download_dir: Path | None = None,
+    ) -> RequestResult:
+        entry = request.entry
+        headers = template.headers
+        params = template.build_params(request)
+        timeout = self._effective_timeout(template)
+        session = await self._ensure_session(template)
+
+        started = time.monotonic()
         result = await self._request(
             entry.url,
             headers=headers,
             params=params,
             timeout=timeout,
+            session=session,
+            download_dir=download_dir,
+            max_bytes=template.max_bytes,
         )
+        self._record_latency(template, result, timeout, time.monotonic() - started)
 
         if not result.ok:
             return result
@@ -113,24 +356,129 @@ class RemoteDataService:
         if entry.parse:
             result.parse_nested(entry.parse)
 
-        for url in result.extract_urls():
-            downloaded = await self._request(
-                url,
-                headers=headers,
-                params=params,
-                timeout=timeout,
-            )
-            if downloaded.is_binary:
-                return downloaded
+        # The learned timeout fits the primary response only; media links
+        # are bounded by the static site timeout (and `link_timeout` stalls).
+        downloaded = await self._download_first(
+            result.extract_urls(),
+            headers=headers,
+            params=params,
+            timeout=template.timeout,
+            session=session,
+            download_dir=download_dir,
+            max_bytes=template.max_bytes,
+        )
+        if downloaded is not None:
+            return downloaded
 
         result.extract_html_text()
 
         if not result.is_valid():
+            result.business_error = result.ok and result.status is not None
             result.error = result.error or "Invalid response"
             return result
 
         return result
 
+    def _effective_timeout(self, template: RequestTemplate) -> ClientTimeout:
+        if self.timeout_factor <= 0 or template.timeout.total is None:
+            return template.timeout
+        seconds = self.latency.timeout_for(template.site_key, template.timeout.total)
+        if seconds == template.timeout.total:
+            return template.timeout
+        return ClientTimeout(seconds)
+
+    def _record_latency(
+        self,
+        template: RequestTemplate,
+        result: RequestResult,
+        timeout: ClientTimeout,
+        elapsed: float,
+    ) -> None:
+        if self.timeout_factor <= 0:
+            return
+        if result.timed_out:
+            # Censored sample: the request took at least the whole timeout.
+            self.latency.record(
+                template.site_key, timeout.total or elapsed, timed_out=True
+            )
+        elif result.status is not None:
+            self.latency.record(template.site_key, elapsed)
+
+    async def _download_first(
+        self,
+        urls: list[str],
+        *,
+        headers: Mapping[str, Any],
+        params: Mapping[str, Any],
+        timeout: ClientTimeout,
+        session: ClientSession,
+        download_dir: Path | None,
+        max_bytes: int,
+    ) -> RequestResult | None:
+        """Race extracted URLs and return the first non-empty binary result.
+
+        Up to `hedge_width` URLs are in flight at once; each failure starts
+        the next candidate. Once a winner is found the remaining attempts are
+        cancelled and their temp files removed.
+        """
+        if not urls:
+            return None
+        link_timeout = timeout
+        if self.link_timeout > 0:
+            # A dead link fails fast, a slow but steady download is not cut.
+            link_timeout = ClientTimeout(
+                total=timeout.total,
+                sock_connect=self.link_timeout,
+                sock_read=self.link_timeout,
+            )
+        width = max(1, self.hedge_width)
+        candidates = iter(urls)
+        running: set[asyncio.Task[RequestResult]] = set()
+
+        def launch() -> bool:
+            url = next(candidates, None)
+            if url is None:
+                return False
+            running.add(
+                asyncio.create_task(
+                    self._request(
+                        url,
+                        headers=headers,
+                        params=params,
+                        timeout=link_timeout,
+                        session=session,
+                        download_dir=download_dir,
+                        max_bytes=max_bytes,
+                    )
+                )
+            )
+            return True
+
+        winner: RequestResult | None = None
+        try:
+            while len(running) < width and launch():
+                pass
+            while running and winner is None:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    running.discard(task)
+                    downloaded = task.result()
+                    if winner is None and downloaded.binary_size:
+                        winner = downloaded
+                    else:
+                        downloaded.discard_file()
+                while winner is None and len(running) < width and launch():
+                    pass
+        finally:
+            for task in running:
+                task.cancel()
+            for leftover in await asyncio.gather(*running, return_exceptions=True):
+                if isinstance(leftover, RequestResult):
+                    leftover.discard_file()
+        return winner
+
     @staticmethod
     def _build_test_reason(result: RequestResult) -> str:
         if result.error:
@@ -139,7 +487,7 @@ class RemoteDataService:
             return "No HTTP status"
         if result.status < 200 or result.status >= 300:
             return f"HTTP {result.status}"
-        if result.is_binary and not result.raw_content:
+        if result.is_binary and not result.binary_size:
             return "Empty binary response"
         if result.is_text and not (result.raw_text or "").strip():
             return "Empty text response"
@@ -154,22 +502,28 @@ class RemoteDataService:
             if len(text) > limit:
                 return f"{text[:limit]}..."
             return text
-        if result.raw_content:
-            return f"<binary {len(result.raw_content)} bytes>"
+        if result.binary_size:
+            return f"<binary {result.binary_size} bytes>"
         return ""
 
     async def stream_test_apis(
         self,
-        entries: list[APIEntry] | None = None,
+        requests: list[APIRequestContext] | None = None,
         persist_valid_result: (
             Callable[[APIEntry, RequestResult], Awaitable[None]] | None
         ) = None,
     ) -> AsyncIterator[dict[str, Any]]:
         """
         Batch test APIs and yield progress events one by one.
+
+        Entries of the same base URL are tested sequentially; pacing comes
+        from the per-site scheduler, which batch tests wait on instead of
+        being rejected.
         """
-        entries = entries or self.api_mgr.list_entries()
-        total = len(entries)
+        requests = requests or [
+            APIRequestContext(entry) for entry in self.api_mgr.list_entries()
+        ]
+        total = len(requests)
         if total == 0:
             yield {
                 "event": "start",
@@ -185,9 +539,9 @@ class RemoteDataService:
             }
             return
 
-        site_to_entries: dict[str, list[APIEntry]] = defaultdict(list)
-        for entry in entries:
-            site_to_entries[entry.get_base_url()].append(entry)
+        site_to_requests: dict[str, list[APIRequestContext]] = defaultdict(list)
+        for request in requests:
+            site_to_requests[request.entry.get_base_url()].append(request)
 
         succeeded: set[str] = set()
         completed = 0
@@ -202,24 +556,22 @@ class RemoteDataService:
             tuple[APIEntry | None, RequestResult | Exception | None]
         ] = asyncio.Queue()
 
-        async def site_worker(site_entries: list[APIEntry]) -> None:
-            for index, entry in enumerate(site_entries):
+        async def site_worker(site_requests: list[APIRequestContext]) -> None:
+            for request in site_requests:
                 try:
-                    result = await self.get_data(entry)
-                    await queue.put((entry, result))
+                    result = await self.get_data(
+                        request, block=True, short_circuit=False
+                    )
+                    await queue.put((request.entry, result))
                 except Exception as exc:
-                    await queue.put((entry, exc))
-
-                has_more = index < len(site_entries) - 1
-                if has_more and self.batch_site_interval_seconds > 0:
-                    await asyncio.sleep(self.batch_site_interval_seconds)
+                    await queue.put((request.entry, exc))
 
             await queue.put((None, None))
 
         site_workers = [
-            asyncio.create_task(site_worker(list(site_entries)))
-            for site_entries in site_to_entries.values()
-            if site_entries
+            asyncio.create_task(site_worker(list(site_requests)))
+            for site_requests in site_to_requests.values()
+            if site_requests
         ]
 
         completed_workers = 0
@@ -287,7 +639,9 @@ class RemoteDataService:
             await asyncio.gather(*site_workers, return_exceptions=True)
 
         success_names = list(succeeded)
-        failed_names = [entry.name for entry in entries if entry.name not in succeeded]
+        failed_names = [
+            request.name for request in requests if request.name not in succeeded
+        ]
 
         self.api_mgr.set_entries_valid(success_names, True)
         self.api_mgr.set_entries_valid(failed_names, False)
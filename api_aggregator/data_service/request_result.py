@@ -1,6 +1,7 @@
 import json
 import re
 from dataclasses import dataclass
+from pathlib import Path
 from urllib.parse import unquote, urlparse
 
 from bs4 import BeautifulSoup
@@ -16,6 +17,14 @@ class RequestResult:
     content_type: str | None = None
     error: str | None = None
     final_url: str | None = None
+    timed_out: bool = False
+    # The response arrived but `is_valid` rejected it (e.g. bad params).
+    business_error: bool = False
+
+    # Streamed downloads land in a temp file instead of `raw_content`.
+    file_path: Path | None = None
+    file_hash: str | None = None
+    file_size: int = 0
 
     # --------------------------
     # Basic properties
@@ -31,7 +40,13 @@ class RequestResult:
 
     @property
     def is_binary(self) -> bool:
-        return self.raw_content is not None
+        return self.raw_content is not None or self.file_path is not None
+
+    @property
+    def binary_size(self) -> int:
+        if self.raw_content is not None:
+            return len(self.raw_content)
+        return self.file_size
 
     @property
     def text(self) -> str | None:
@@ -41,6 +56,12 @@ class RequestResult:
     def content(self) -> bytes | None:
         return self.raw_content
 
+    def discard_file(self) -> None:
+        """Delete the streamed temp file, if any."""
+        if self.file_path is not None:
+            self.file_path.unlink(missing_ok=True)
+            self.file_path = None
+
     # --------------------------
     # Data processing logic
     # --------------------------
@@ -204,7 +225,7 @@ class RequestResult:
 
         # Binary data
         if self.is_binary:
-            return bool(self.raw_content and len(self.raw_content) > 0)
+            return self.binary_size > 0
 
         # Text data must exist
         if not self.raw_text:
@@ -0,0 +1,72 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from aiohttp import ClientTimeout
+
+from ..entry import APIEntry, APIRequestContext, SiteEntry
+
+
+@dataclass(frozen=True)
+class RequestTemplate:
+    """Precomputed request arguments of one API entry.
+
+    Built once per (entry, site pool generation); at request time only the
+    runtime `updated_params` overlay is left to apply. Headers and params are
+    read-only views shared by every call. It keeps no reference to the
+    entry, which keys the weak template cache.
+    """
+
+    site: SiteEntry | None
+    site_generation: int
+    # Scheduling key: the site name, or the base URL for unmatched APIs.
+    site_key: str
+    url: str
+    headers: Mapping[str, Any]
+    params: Mapping[str, Any]
+    keys: Mapping[str, Any]
+    timeout: ClientTimeout
+    max_bytes: int = 0
+
+    @classmethod
+    def build(
+        cls,
+        entry: APIEntry,
+        site: SiteEntry | None,
+        *,
+        site_generation: int,
+        default_headers: Mapping[str, Any],
+        default_timeout: int,
+        default_max_bytes: int = 0,
+    ) -> "RequestTemplate":
+        headers = dict(site.headers) if site else dict(default_headers)
+        keys = dict(site.keys) if site else {}
+        params = dict(entry.params or {})
+        if keys:
+            headers.update(keys)
+            params.update(keys)
+        # A site-level size cap replaces the per-type default.
+        max_bytes = default_max_bytes
+        if site and site.limits.max_response_mb is not None:
+            max_bytes = int(site.limits.max_response_mb * 1024 * 1024)
+        return cls(
+            site=site,
+            site_generation=site_generation,
+            site_key=site.name if site else entry.get_base_url(),
+            url=entry.url,
+            headers=MappingProxyType(headers),
+            params=MappingProxyType(params),
+            keys=MappingProxyType(keys),
+            timeout=ClientTimeout(site.timeout if site else default_timeout),
+            max_bytes=max_bytes,
+        )
+
+    def build_params(self, request: APIRequestContext) -> Mapping[str, Any]:
+        """Static params with the request's runtime overlay; site keys win."""
+        if not request.updated_params:
+            return self.params
+        params = dict(request.entry.params or {})
+        params.update(request.updated_params)
+        params.update(self.keys)
+        return params
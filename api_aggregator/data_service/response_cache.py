@@ -0,0 +1,114 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from ..database import SQLiteDatabase
+from ..entry import APIEntry
+from ..log import logger
+
+
+@dataclass
+class CacheStats:
+    """Hit counters of one API."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class ResponseCache:
+    """Text response cache for APIs with a `cache` policy.
+
+    An in-memory LRU of `capacity` entries sits in front of the SQLite
+    `response_cache` table, so cached responses survive restarts. Keys are
+    derived from the URL, the effective params and the parse path.
+    """
+
+    # Expired rows are swept from SQLite once per this many writes.
+    SWEEP_EVERY = 100
+
+    def __init__(self, db: SQLiteDatabase | None = None, capacity: int = 256) -> None:
+        self.db = db
+        self.capacity = capacity
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._stats: dict[str, CacheStats] = {}
+        self._writes = 0
+
+    @staticmethod
+    def make_key(entry: APIEntry, params: Mapping[str, Any]) -> str:
+        raw = json.dumps(
+            [entry.url, dict(params), entry.parse],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _count(self, name: str, hit: bool) -> None:
+        stats = self._stats.setdefault(name, CacheStats())
+        if hit:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+
+    def _remember(self, key: str, expires_at: float, text: str) -> None:
+        self._entries[key] = (expires_at, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def get(self, entry: APIEntry, key: str) -> str | None:
+        now = time.time()
+        cached = self._entries.get(key)
+        if cached is None and self.db is not None:
+            row = None
+            try:
+                row = self.db.load_cached_response(key)
+            except Exception as exc:
+                logger.warning(f"Load cached response failed [{entry.name}]: {exc}")
+            if row is not None:
+                text, expires_at = row
+                cached = (expires_at, text)
+                self._remember(key, expires_at, text)
+        if cached is not None and cached[0] <= now:
+            self._entries.pop(key, None)
+            cached = None
+        self._count(entry.name, cached is not None)
+        if cached is None:
+            return None
+        self._entries.move_to_end(key)
+        return cached[1]
+
+    def put(self, entry: APIEntry, key: str, text: str) -> None:
+        now = time.time()
+        expires_at = entry.cache.expires_at(now)
+        if expires_at <= now:
+            return
+        self._remember(key, expires_at, text)
+        if self.db is None:
+            return
+        try:
+            self.db.save_cached_response(key, entry.name, text, expires_at)
+            self._writes += 1
+            if self._writes % self.SWEEP_EVERY == 0:
+                self.db.delete_expired_responses(now)
+        except Exception as exc:
+            logger.warning(f"Save cached response failed [{entry.name}]: {exc}")
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        return {name: stats.to_dict() for name, stats in self._stats.items()}
@@ -0,0 +1,91 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from ..model import DataResource
+
+
+class _Flight:
+    """One in-flight fetch and the callers waiting on it."""
+
+    def __init__(self) -> None:
+        self.task: asyncio.Task[DataResource | None] | None = None
+        self.waiters = 0
+        self._handles: list[DataResource] | None = None
+
+    def take(self) -> DataResource | None:
+        """Result handle of one waiter; shared files are unlinked by the last."""
+        assert self.task is not None
+        result = self.task.result()
+        if result is None or self.waiters <= 1:
+            return result
+        if self._handles is None:
+            self._handles = result.share(self.waiters)
+        return self._handles.pop()
+
+    def leave(self) -> None:
+        self.waiters -= 1
+        if self._handles:
+            self._handles.pop().unlink()
+
+
+class SingleFlight:
+    """Coalesces concurrent fetches of the same key into shared calls.
+
+    Up to `fanout` calls per key run at once, so random-content APIs can
+    still hand out distinct results; further callers join the call with the
+    fewest waiters and receive its result.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, list[_Flight]] = {}
+        self.started = 0
+        self.joined = 0
+
+    async def _fly(
+        self,
+        key: Hashable,
+        flight: _Flight,
+        factory: Callable[[], Awaitable[DataResource | None]],
+    ) -> DataResource | None:
+        try:
+            return await factory()
+        finally:
+            flights = self._flights.get(key, [])
+            if flight in flights:
+                flights.remove(flight)
+            if not flights:
+                self._flights.pop(key, None)
+
+    async def run(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[DataResource | None]],
+        *,
+        fanout: int = 1,
+    ) -> DataResource | None:
+        flights = self._flights.setdefault(key, [])
+        if len(flights) < max(1, fanout):
+            flight = _Flight()
+            flight.task = asyncio.create_task(self._fly(key, flight, factory))
+            flights.append(flight)
+            self.started += 1
+        else:
+            flight = min(flights, key=lambda item: item.waiters)
+            self.joined += 1
+
+        assert flight.task is not None
+        flight.waiters += 1
+        try:
+            await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            flight.leave()
+            raise
+        return flight.take()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": sum(len(flights) for flights in self._flights.values()),
+            "started": self.started,
+            "joined": self.joined,
+        }
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from ..entry import SiteEntry
+from ..model import SiteLimitOptions
+
+
+class SiteBusyError(Exception):
+    """Raised when a site has no free slot or token within the queue wait."""
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations in arrival order.
+
+    A reservation may drive the balance negative; the caller then sleeps
+    until its token has been refilled, so waiters never overtake each other.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def reserve(self, max_wait: float | None) -> float | None:
+        """Reserve one token; return the delay before it may be used.
+
+        Returns `None` (reserving nothing) when the delay would exceed
+        `max_wait`.
+        """
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        delay = max(0.0, (1 - self.tokens) / self.rate)
+        if max_wait is not None and delay > max_wait:
+            return None
+        self.tokens -= 1
+        return delay
+
+
+class _SiteSlot:
+    def __init__(self, options: SiteLimitOptions) -> None:
+        self.options = options
+        limit = options.max_in_flight or 0
+        self.semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+        rate = options.rate_per_second or 0.0
+        self.bucket = (
+            TokenBucket(rate, options.burst or int(rate) or 1) if rate > 0 else None
+        )
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+
+class SiteScheduler:
+    """Per-site concurrency cap plus requests-per-second token bucket.
+
+    Slots are keyed by site name (or by base URL for APIs without a site).
+    Callers wait at most `queue_timeout` seconds for both a free slot and a
+    token, otherwise `SiteBusyError` is raised so the caller can fall back
+    instead of piling more load onto the upstream.
+    """
+
+    def __init__(
+        self,
+        defaults: SiteLimitOptions | None = None,
+        *,
+        queue_timeout: float | None = 3.0,
+    ) -> None:
+        self.defaults = defaults or SiteLimitOptions()
+        self.queue_timeout = queue_timeout
+        self._slots: dict[str, _SiteSlot] = {}
+
+    def _get_slot(self, key: str, site: SiteEntry | None) -> _SiteSlot:
+        options = (
+            self.defaults.merged(site.limits) if site is not None else self.defaults
+        )
+        slot = self._slots.get(key)
+        if slot is None or slot.options != options:
+            # In-flight requests keep the old slot; new ones use the new limits.
+            slot = _SiteSlot(options)
+            self._slots[key] = slot
+        return slot
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        key: str,
+        site: SiteEntry | None = None,
+        *,
+        block: bool = False,
+    ) -> AsyncIterator[None]:
+        """Hold one request slot of `key`.
+
+        Queueing is bounded by `queue_timeout` unless `block` is set, in which
+        case the caller waits as long as needed (used by batch tests).
+        """
+        slot = self._get_slot(key, site)
+        max_wait = None if block else self.queue_timeout
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+
+        slot.waiting += 1
+        try:
+            if slot.semaphore is not None:
+                try:
+                    await asyncio.wait_for(slot.semaphore.acquire(), max_wait)
+                except asyncio.TimeoutError:
+                    slot.rejected += 1
+                    raise SiteBusyError(f"site busy: {key}") from None
+            try:
+                if slot.bucket is not None:
+                    remaining = (
+                        None
+                        if deadline is None
+                        else max(0.0, deadline - time.monotonic())
+                    )
+                    delay = slot.bucket.reserve(remaining)
+                    if delay is None:
+                        slot.rejected += 1
+                        raise SiteBusyError(f"site rate limited: {key}")
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+            except BaseException:
+                if slot.semaphore is not None:
+                    slot.semaphore.release()
+                raise
+        finally:
+            slot.waiting -= 1
+
+        slot.in_flight += 1
+        try:
+            yield
+        finally:
+            slot.in_flight -= 1
+            slot.completed += 1
+            if slot.semaphore is not None:
+                slot.semaphore.release()
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            key: {
+                "in_flight": slot.in_flight,
+                "waiting": slot.waiting,
+                "completed": slot.completed,
+                "rejected": slot.rejected,
+                **slot.options.to_dict(),
+            }
+            for key, slot in self._slots.items()
+        }
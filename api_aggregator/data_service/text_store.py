@@ -0,0 +1,191 @@
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+
+from ..log import logger
+
+
+class TextDataset:
+    """Append-only text dataset: one JSON string per line.
+
+    The `{name}.offsets` sidecar holds a 16 byte header (magic, data file
+    size) followed by one little-endian uint64 start offset per record.
+    Saving appends to both files, so it costs O(1) regardless of the dataset
+    size, and the fixed-width offsets let `read_at` fetch any record with one
+    seek instead of decoding the whole file. When the header disagrees with
+    the data file (crash, or an external edit) the offsets are rebuilt.
+    Content hashes live in the `LocalCatalog`.
+    """
+
+    SUFFIX = ".jsonl"
+    OFFSETS_SUFFIX = ".offsets"
+    LEGACY_SUFFIX = ".json"
+    LEGACY_INDEX_SUFFIX = ".index.json"
+
+    MAGIC = b"TXO1\0\0\0\0"
+    HEADER = struct.Struct("<8sQ")
+    OFFSET = struct.Struct("<Q")
+
+    def __init__(self, folder: Path, name: str) -> None:
+        self.folder = folder
+        self.name = name
+        self.data_file = folder / f"{name}{self.SUFFIX}"
+        self.offsets_file = folder / f"{name}{self.OFFSETS_SUFFIX}"
+        self.legacy_file = folder / f"{name}{self.LEGACY_SUFFIX}"
+        self.legacy_index_file = folder / f"{name}{self.LEGACY_INDEX_SUFFIX}"
+
+    @staticmethod
+    def encode(text: str) -> bytes:
+        return (json.dumps(text, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @staticmethod
+    def decode(line: bytes) -> str:
+        value = json.loads(line.decode("utf-8"))
+        return value if isinstance(value, str) else str(value)
+
+    def exists(self) -> bool:
+        self.migrate_legacy()
+        return self.data_file.is_file()
+
+    # ================== legacy migration ==================
+
+    def migrate_legacy(self) -> bool:
+        """Convert a legacy `{name}.json` list dataset, once."""
+        if self.data_file.exists() or not self.legacy_file.is_file():
+            return False
+        try:
+            raw = json.loads(self.legacy_file.read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.warning(f"legacy text dataset unreadable {self.legacy_file}: {exc}")
+            return False
+        items = [str(item) for item in raw] if isinstance(raw, list) else []
+        self.rewrite(items)
+        self.legacy_file.unlink()
+        self.legacy_index_file.unlink(missing_ok=True)
+        logger.info(
+            "local text dataset migrated name=%s, items=%d", self.name, len(items)
+        )
+        return True
+
+    # ================== index maintenance ==================
+
+    def _data_size(self) -> int:
+        try:
+            return self.data_file.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def signature(self) -> str:
+        """On-disk state of the data file, as `mtime_ns:size`."""
+        try:
+            stat = self.data_file.stat()
+        except FileNotFoundError:
+            return "0:0"
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _indexed_size(self) -> int:
+        try:
+            with self.offsets_file.open("rb") as fp:
+                header = fp.read(self.HEADER.size)
+        except FileNotFoundError:
+            return -1
+        if len(header) != self.HEADER.size:
+            return -1
+        magic, size = self.HEADER.unpack(header)
+        return size if magic == self.MAGIC else -1
+
+    def ensure_index(self) -> None:
+        """Rebuild the offsets when they do not describe the data file."""
+        if self._indexed_size() == self._data_size():
+            return
+        offsets: list[int] = []
+        position = 0
+        if self.data_file.exists():
+            with self.data_file.open("rb") as fp:
+                for line in fp:
+                    if line.strip():
+                        offsets.append(position)
+                    position += len(line)
+        self._write_index(position, offsets)
+        logger.debug(
+            "local text index rebuilt name=%s, items=%d", self.name, len(offsets)
+        )
+
+    def _write_index(self, data_size: int, offsets: list[int]) -> None:
+        offsets_tmp = self.offsets_file.with_suffix(".offsets.tmp")
+        with offsets_tmp.open("wb") as fp:
+            fp.write(self.HEADER.pack(self.MAGIC, data_size))
+            fp.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        os.replace(offsets_tmp, self.offsets_file)
+
+    # ================== reads ==================
+
+    def count(self) -> int:
+        self.ensure_index()
+        size = self.offsets_file.stat().st_size - self.HEADER.size
+        return max(0, size // self.OFFSET.size)
+
+    def read_at(self, index: int) -> str:
+        """Record `index`: one offset lookup and one mmap'd line read."""
+        self.ensure_index()
+        raw = b""
+        if index >= 0:
+            with self.offsets_file.open("rb") as fp:
+                fp.seek(self.HEADER.size + index * self.OFFSET.size)
+                raw = fp.read(self.OFFSET.size)
+        if len(raw) != self.OFFSET.size:
+            raise IndexError(f"record index out of range: {index}")
+        (start,) = self.OFFSET.unpack(raw)
+        with self.data_file.open("rb") as fp:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = mm.find(b"\n", start)
+                return self.decode(mm[start : end if end >= 0 else len(mm)])
+
+    def read_all(self) -> list[str]:
+        if not self.data_file.exists():
+            return []
+        with self.data_file.open("rb") as fp:
+            return [self.decode(line) for line in fp if line.strip()]
+
+    # ================== writes ==================
+
+    def append(self, text: str) -> tuple[int, int]:
+        """Append one record; returns its position and size in bytes."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.ensure_index()
+        record = self.encode(text)
+        with self.data_file.open("ab") as fp:
+            offset = fp.tell()
+            fp.write(record)
+        with self.offsets_file.open("r+b") as fp:
+            end = fp.seek(0, os.SEEK_END)
+            fp.write(self.OFFSET.pack(offset))
+            fp.seek(0)
+            fp.write(self.HEADER.pack(self.MAGIC, offset + len(record)))
+        return (end - self.HEADER.size) // self.OFFSET.size, len(record)
+
+    def rewrite(self, items: list[str]) -> None:
+        """Replace the whole dataset (used by migration and deletes)."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        offsets: list[int] = []
+        position = 0
+        data_tmp = self.data_file.with_suffix(".jsonl.tmp")
+        with data_tmp.open("wb") as fp:
+            for text in items:
+                record = self.encode(text)
+                offsets.append(position)
+                fp.write(record)
+                position += len(record)
+        os.replace(data_tmp, self.data_file)
+        self._write_index(position, offsets)
+
+    def delete(self) -> None:
+        for path in (
+            self.data_file,
+            self.offsets_file,
+            self.legacy_file,
+            self.legacy_index_file,
+        ):
+            path.unlink(missing_ok=True)
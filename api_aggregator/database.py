@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import time
 from pathlib import Path
 from typing import Any
 
@@ -48,6 +49,28 @@ class SQLiteDatabase:
                 )
                 """
             )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    api TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS site_latency (
+                    site TEXT PRIMARY KEY,
+                    timeout REAL NOT NULL,
+                    p50 REAL NOT NULL DEFAULT 0,
+                    p99 REAL NOT NULL DEFAULT 0,
+                    samples INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
             conn.commit()
 
     @staticmethod
@@ -204,26 +227,31 @@ class SQLiteDatabase:
         *,
         upserts: list[dict[str, Any]],
         delete_names: list[str],
-    ) -> dict[str, Any]:
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        """Return the updated copy of `pool` and the batch stats.
+
+        The input list is never mutated, so callers can swap the result in
+        while readers keep iterating over the previous list.
+        """
         delete_set = set(delete_names)
         updated = 0
         deleted = 0
         inserted = 0
         changed = False
 
+        rows = list(pool)
         if delete_set:
-            before = len(pool)
-            pool[:] = [
+            rows = [
                 row
-                for row in pool
+                for row in rows
                 if FieldCaster.normalize_name(row.get("name")) not in delete_set
             ]
-            deleted = before - len(pool)
+            deleted = len(pool) - len(rows)
             changed = deleted > 0
 
         index_by_name = {
             FieldCaster.normalize_name(row.get("name")): index
-            for index, row in enumerate(pool)
+            for index, row in enumerate(rows)
             if FieldCaster.normalize_name(row.get("name"))
         }
         for row in upserts:
@@ -232,22 +260,22 @@ class SQLiteDatabase:
                 continue
             index = index_by_name.get(name)
             if index is None:
-                pool.append(row)
-                index_by_name[name] = len(pool) - 1
+                rows.append(row)
+                index_by_name[name] = len(rows) - 1
                 inserted += 1
                 changed = True
             else:
-                if pool[index] != row:
-                    pool[index] = row
+                if rows[index] != row:
+                    rows[index] = row
                     updated += 1
                     changed = True
 
-        return {
+        return rows, {
             "changed": changed,
             "inserted": inserted,
             "updated": updated,
             "deleted": deleted,
-            "total": len(pool),
+            "total": len(rows),
         }
 
     def save_site_pool(self) -> None:
@@ -273,16 +301,19 @@ class SQLiteDatabase:
         normalized_api_upserts = self._normalize_upserts(api_upserts)
         normalized_api_deletes = self._normalize_delete_names(api_delete_names)
 
-        site_stats = self._apply_pool_batch(
+        site_pool, site_stats = self._apply_pool_batch(
             self.site_pool,
             upserts=normalized_site_upserts,
             delete_names=normalized_site_deletes,
         )
-        api_stats = self._apply_pool_batch(
+        api_pool, api_stats = self._apply_pool_batch(
             self.api_pool,
             upserts=normalized_api_upserts,
             delete_names=normalized_api_deletes,
         )
+        # Swap in the new lists; readers holding the old ones are unaffected.
+        self.site_pool = site_pool
+        self.api_pool = api_pool
         changed_tables: list[str] = []
         try:
             with self._connect() as conn:
@@ -358,6 +389,78 @@ class SQLiteDatabase:
             [json.loads(str(row["payload"])) for row in api_rows]
         )
 
+    def load_site_latency(self) -> dict[str, dict[str, Any]]:
+        """Learned per-site timeouts keyed by site."""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT site, timeout, p50, p99, samples FROM site_latency"
+                ).fetchall()
+        except Exception as exc:
+            logger.error("load site latency failed: %s", exc)
+            return {}
+        return {str(row["site"]): dict(row) for row in rows}
+
+    def save_site_latency(self, rows: list[dict[str, Any]]) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO site_latency (site, timeout, p50, p99, samples, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(site) DO UPDATE SET
+                    timeout = excluded.timeout,
+                    p50 = excluded.p50,
+                    p99 = excluded.p99,
+                    samples = excluded.samples,
+                    updated_at = excluded.updated_at
+                """,
+                [
+                    (
+                        str(row["site"]),
+                        float(row["timeout"]),
+                        float(row.get("p50") or 0),
+                        float(row.get("p99") or 0),
+                        int(row.get("samples") or 0),
+                        now,
+                    )
+                    for row in rows
+                ],
+            )
+            conn.commit()
+
+    def load_cached_response(self, key: str) -> tuple[str, float] | None:
+        """Cached text and expiry of `key`, if any."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT text, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return str(row["text"]), float(row["expires_at"])
+
+    def save_cached_response(
+        self, key: str, api: str, text: str, expires_at: float
+    ) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO response_cache (key, api, text, expires_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (key, api, text, expires_at),
+            )
+            conn.commit()
+
+    def delete_expired_responses(self, now: float | None = None) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM response_cache WHERE expires_at <= ?",
+                (time.time() if now is None else now,),
+            )
+            conn.commit()
+            return cursor.rowcount
+
     @staticmethod
     def _to_page_size(value: Any) -> int | str:
         text = str(value).strip().lower()
@@ -1,6 +1,12 @@
-from .api_entry import APIEntry
+from .api_entry import APIEntry, APIRequestContext
 from .api_mgr import APIEntryManager
 from .site_entry import SiteEntry
 from .site_mgr import SiteEntryManager
 
-__all__ = ["APIEntry", "APIEntryManager", "SiteEntry", "SiteEntryManager"]
+__all__ = [
+    "APIEntry",
+    "APIEntryManager",
+    "APIRequestContext",
+    "SiteEntry",
+    "SiteEntryManager",
+]
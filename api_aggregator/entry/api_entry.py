@@ -1,15 +1,23 @@
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass, field
 from typing import Any
 from urllib.parse import urlparse
 
 from ..log import logger
-from ..model import ApiPayload, DataType, FieldCaster
+from ..model import ApiPayload, CachePolicy, DataType, FieldCaster
+from .keyword_matcher import KeywordMatcher
 
 
 class APIEntry:
-    """API entry."""
+    """API entry.
+
+    Entries published by `APIEntryManager` are shared with callers and must be
+    treated as read-only; the manager swaps in a new entry (see `replace`)
+    instead of mutating one in place. Per-call data lives in
+    `APIRequestContext`.
+    """
 
     @classmethod
     def _normalize_data(cls, data: dict[str, Any]) -> dict[str, Any]:
@@ -32,14 +40,14 @@ class APIEntry:
         self.keywords = FieldCaster.to_str_list(normalized["keywords"])
         self.valid = FieldCaster.to_bool(normalized["valid"], default=True)
         self.site = normalized["site"]
+        self.cache = CachePolicy.from_raw(normalized["cache"])
+        self.fanout = normalized["fanout"]
         try:
             self._data_type = DataType.from_str(self.type)
         except Exception:
             self.type = DataType.TEXT.value
             self._data_type = DataType.TEXT
-        self._compiled_patterns: list[re.Pattern] = []
-        self._compile_patterns()
-        self.updated_params: dict[str, Any] = {}
+        self._normalize_keywords()
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dict."""
@@ -54,8 +62,16 @@ class APIEntry:
             "keywords": FieldCaster.to_str_list(self.keywords),
             "valid": self.valid,
             "site": self.site,
+            "cache": self.cache.to_dict(),
+            "fanout": self.fanout,
         }
 
+    def replace(self, **changes: Any) -> APIEntry:
+        """Return a new entry with the given fields changed."""
+        data = self.to_dict()
+        data.update(changes)
+        return APIEntry(data)
+
     @property
     def data_type(self) -> DataType:
         """Data type."""
@@ -72,15 +88,19 @@ class APIEntry:
 
     # =============== Regex ===================
 
-    def _compile_patterns(self) -> None:
-        """Compile keyword regex patterns."""
-        self._compiled_patterns.clear()
+    def _normalize_keywords(self) -> None:
+        """Drop blank keywords and warn about invalid regex ones.
+
+        Matching itself is done by the manager's shared `KeywordMatcher`.
+        """
         if self.keywords:
             self.keywords = [k for k in self.keywords if k.strip()]
 
             for pattern in self.keywords:
+                if KeywordMatcher.is_literal(pattern):
+                    continue
                 try:
-                    self._compiled_patterns.append(re.compile(pattern))
+                    re.compile(pattern)
                 except re.error as e:
                     logger.warning(
                         f"[entry:{self.name}] regex compile failed: {pattern} ({e})"
@@ -88,7 +108,7 @@ class APIEntry:
 
     def set_keywords(self, keywords: list[str]) -> None:
         self.keywords = FieldCaster.to_str_list(keywords, default=[])
-        self._compile_patterns()
+        self._normalize_keywords()
 
     def add_scope(self, scope: str) -> bool:
         value = str(scope or "").strip()
@@ -108,68 +128,14 @@ class APIEntry:
         self.scope = [item for item in self.scope if item != value]
         return True
 
-    def _match_keywords(self, text: str) -> bool:
-        """Whether any keyword regex matches."""
-        for p in self._compiled_patterns:
-            if p.search(text):
-                return True
-        return False
-
-    # =============== Activation decision ==================
-
-    def _allow_scope(
-        self,
-        *,
-        user_id: str,
-        group_id: str,
-        session_id: str,
-        is_admin: bool,
-    ) -> bool:
-        """Scope access gate."""
-        if not self.scope:
-            return True
-
-        for s in self.scope:
-            if s == "admin" and is_admin:
-                return True
-            if s == user_id:
-                return True
-            if s == group_id:
-                return True
-            if s == session_id:
-                return True
-        return False
-
-    def check_activate(
-        self,
-        *,
-        text: str,
-        user_id: str,
-        group_id: str,
-        session_id: str,
-        is_admin: bool,
-    ) -> bool:
-        """Unified activation check."""
-
-        # Gate 1: global switch
-        if not self.enabled:
-            return False
-
-        # Gate 2: validity
-        if not self.valid:
-            return False
 
-        # Gate 3: scope gate
-        if not self._allow_scope(
-            user_id=user_id,
-            group_id=group_id,
-            session_id=session_id,
-            is_admin=is_admin,
-        ):
-            return False
+@dataclass(frozen=True)
+class APIRequestContext:
+    """One invocation of an API entry with its runtime param overlay."""
 
-        # Gate 4: regex match
-        if not self._match_keywords(text):
-            return False
+    entry: APIEntry
+    updated_params: dict[str, Any] = field(default_factory=dict)
 
-        return True
+    @property
+    def name(self) -> str:
+        return self.entry.name
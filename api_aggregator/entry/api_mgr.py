@@ -1,27 +1,63 @@
 from __future__ import annotations
 
-import copy
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import Callable, Container
 from typing import Any
 
 from ..database import SQLiteDatabase
 from ..log import logger
 from ..model import ApiPayload, DataType, FieldCaster
 from .api_entry import APIEntry
+from .pool_snapshot import APIPoolSnapshot, PoolDraft
 
 
 class APIEntryManager:
-    """Manage API entries and persistence mapping."""
+    """Manage API entries and persistence mapping.
+
+    The pool is published as an immutable `APIPoolSnapshot`. Mutations stage
+    their changes on a `PoolDraft` and swap in the next snapshot in one
+    assignment, so readers such as `match_entries` never observe a half
+    applied batch and need neither locks nor defensive copies.
+    """
+
+    MATCH_CACHE_SIZE = 2048
 
     def __init__(self, db: SQLiteDatabase):
 
         self.db = db
-        self.pool = self.db.api_pool
-        self.entries: list[APIEntry] = []
+        self._snapshot = APIPoolSnapshot((), ())
+        self._suffix_hints: dict[str, int] = {}
+
+        # Match results are cached per snapshot generation, so results from an
+        # older pool are never served.
+        self._match_cache: OrderedDict[tuple, tuple[str, ...]] = OrderedDict()
+        self._match_cache_generation = 0
+        self._match_cache_hits = 0
+        self._match_cache_misses = 0
+
+    @property
+    def snapshot(self) -> APIPoolSnapshot:
+        """Current pool snapshot; never mutated once published."""
+        return self._snapshot
+
+    @property
+    def entries(self) -> tuple[APIEntry, ...]:
+        return self._snapshot.entries
+
+    @property
+    def pool(self) -> tuple[dict[str, Any], ...]:
+        return self._snapshot.rows
+
+    def _publish(self, draft: PoolDraft) -> None:
+        if draft.base is not self._snapshot:
+            raise RuntimeError("api pool changed while a draft was open")
+        self._snapshot = self._snapshot.evolve(draft)
 
     async def initialize(self) -> None:
         # Support restart: rebuild in-memory entries from current pool state.
-        stored_entries = [dict(item) for item in self.pool if isinstance(item, dict)]
+        stored_entries = [
+            dict(item) for item in self.db.api_pool if isinstance(item, dict)
+        ]
         old_names = [
             str(item.get("name", "")).strip()
             for item in stored_entries
@@ -48,8 +84,12 @@ class APIEntryManager:
             loaded.append(entry)
             normalized_rows.append(normalized)
 
-        self.entries[:] = loaded
-        self.pool[:] = normalized_rows
+        self._suffix_hints.clear()
+        self._snapshot = APIPoolSnapshot(
+            loaded,
+            normalized_rows,
+            generation=self._snapshot.generation + 1,
+        )
 
         # Persist only when load phase fixed/removed invalid rows.
         if dirty:
@@ -59,28 +99,25 @@ class APIEntryManager:
             )
 
     def get_entry(self, name: str) -> APIEntry | None:
-        for entry in self.entries:
-            if entry.name == name:
-                return entry
-        return None
+        return self._snapshot.by_name.get(name)
 
     def list_entries(self) -> list[APIEntry]:
-        return list(self.entries)
+        return list(self._snapshot.entries)
 
     def list_entries_names(self) -> list[str]:
-        return [entry.name for entry in self.entries]
+        return list(self._snapshot.by_name)
 
     def list_enabled_entries(self) -> list[APIEntry]:
-        return [entry for entry in self.entries if entry.enabled]
+        return [entry for entry in self._snapshot.entries if entry.enabled]
 
     def list_disabled_entries(self) -> list[APIEntry]:
-        return [entry for entry in self.entries if not entry.enabled]
+        return [entry for entry in self._snapshot.entries if not entry.enabled]
 
     def list_invalid_entries(self) -> list[APIEntry]:
-        return [entry for entry in self.entries if not entry.valid]
+        return [entry for entry in self._snapshot.entries if not entry.valid]
 
     def list_valid_entries(self) -> list[APIEntry]:
-        return [entry for entry in self.entries if entry.valid]
+        return [entry for entry in self._snapshot.entries if entry.valid]
 
     def set_entries_valid(
         self,
@@ -89,29 +126,26 @@ class APIEntryManager:
     ) -> tuple[list[str], list[str]]:
         success: list[str] = []
         failed: list[str] = []
-        changed = False
-        dirty_names: set[str] = set()
+        changed_rows: list[dict[str, Any]] = []
+        draft = self._snapshot.draft()
 
-        cfg_map = {cfg.get("name"): cfg for cfg in self.pool}
         for name in names:
-            entry = self.get_entry(name)
+            entry = draft.get(name)
             if not entry:
                 failed.append(name)
                 continue
 
             if entry.valid != valid:
-                entry.valid = valid
-                cfg = cfg_map.get(name)
-                if isinstance(cfg, dict):
-                    cfg["valid"] = valid
-                changed = True
-                dirty_names.add(name)
+                entry = entry.replace(valid=valid)
+                row = dict(draft.get_row(name) or {})
+                row["valid"] = valid
+                # Keywords and scope are unchanged; only the flag moves.
+                draft.replace(name, entry, row, reindex=False)
+                changed_rows.append(entry.to_dict())
             success.append(name)
 
-        if changed:
-            changed_rows = [
-                entry.to_dict() for entry in self.entries if entry.name in dirty_names
-            ]
+        if changed_rows:
+            self._publish(draft)
             self.db.batch_update_api_pool(upserts=changed_rows)
 
         return success, failed
@@ -124,49 +158,95 @@ class APIEntryManager:
         group_id: str = "",
         session_id: str = "",
         is_admin: bool = False,
-        only_enabled: bool = True,
     ) -> list[APIEntry]:
         """Match entries by text and runtime context.
 
-        Returns deep-copied entries so callers can safely mutate runtime params
-        (for example `entry.updated_params`) without affecting manager state.
+        Keywords are resolved in one pass by the snapshot's `KeywordMatcher`
+        and intersected with its scope index; only the remaining hits are
+        checked for the enabled/valid flags.
+
+        Results are memoized per (text, user, group, session, admin) in a
+        bounded LRU cache that is dropped whenever a new snapshot is published.
+
+        Returns the shared, read-only entries; wrap them in an
+        `APIRequestContext` to attach per-call runtime params.
         """
-        candidates = self.list_enabled_entries() if only_enabled else self.entries
-        matched: list[APIEntry] = []
-        for entry in candidates:
-            if entry.check_activate(
-                text=text,
+        snapshot = self._snapshot
+        if self._match_cache_generation != snapshot.generation:
+            self._match_cache.clear()
+            self._match_cache_generation = snapshot.generation
+        key = (text, user_id, group_id, session_id, is_admin)
+        names = self._match_cache.get(key)
+        if names is not None:
+            self._match_cache.move_to_end(key)
+            self._match_cache_hits += 1
+        else:
+            self._match_cache_misses += 1
+            names = self._match_names(
+                snapshot,
+                text,
                 user_id=user_id,
                 group_id=group_id,
                 session_id=session_id,
                 is_admin=is_admin,
-            ):
-                matched.append(copy.deepcopy(entry))
-        return matched
+            )
+            self._match_cache[key] = names
+            if len(self._match_cache) > self.MATCH_CACHE_SIZE:
+                self._match_cache.popitem(last=False)
+        return [snapshot.by_name[name] for name in names]
 
-    def _resolve_unique_name(self, name: str) -> str:
-        if not self.get_entry(name):
+    @staticmethod
+    def _match_names(
+        snapshot: APIPoolSnapshot,
+        text: str,
+        *,
+        user_id: str,
+        group_id: str,
+        session_id: str,
+        is_admin: bool,
+    ) -> tuple[str, ...]:
+        hits = snapshot.matcher.match(text)
+        if hits:
+            hits = snapshot.scope_index.filter(
+                hits,
+                user_id=user_id,
+                group_id=group_id,
+                session_id=session_id,
+                is_admin=is_admin,
+            )
+        if not hits:
+            return ()
+        by_name = snapshot.by_name
+        return tuple(
+            name
+            for name in sorted(hits, key=snapshot.positions.__getitem__)
+            if by_name[name].enabled and by_name[name].valid
+        )
+
+    def get_match_cache_stats(self) -> dict[str, int]:
+        return {
+            "hits": self._match_cache_hits,
+            "misses": self._match_cache_misses,
+            "size": len(self._match_cache),
+            "generation": self._snapshot.generation,
+        }
+
+    def _resolve_unique_name(
+        self, name: str, taken: Container[str] | None = None
+    ) -> str:
+        taken = self._snapshot.by_name if taken is None else taken
+        if name not in taken:
             return name
-        index = 2
+        # Resume from the last suffix handed out so bulk imports of the same
+        # name stay linear.
+        index = self._suffix_hints.get(name, 2)
         while True:
             new_name = f"{name}_{index}"
-            if not self.get_entry(new_name):
+            if new_name not in taken:
+                self._suffix_hints[name] = index + 1
                 return new_name
             index += 1
 
-    def _find_index(self, name: str) -> tuple[int, int]:
-        cfg_idx = -1
-        entry_idx = -1
-        for i, item in enumerate(self.pool):
-            if item.get("name") == name:
-                cfg_idx = i
-                break
-        for i, entry in enumerate(self.entries):
-            if entry.name == name:
-                entry_idx = i
-                break
-        return cfg_idx, entry_idx
-
     @staticmethod
     def _to_bool(value: Any, default: bool = True) -> bool:
         return FieldCaster.to_bool(value, default=default)
@@ -200,13 +280,15 @@ class APIEntryManager:
         normalized.pop("__template_key", None)
         return normalized
 
-    def _build_entry_data(self, payload: dict[str, Any]) -> dict[str, Any]:
+    def _build_entry_data(
+        self, payload: dict[str, Any], taken: Container[str] | None = None
+    ) -> dict[str, Any]:
         normalized = ApiPayload.from_raw(
             payload,
             require_name=True,
             require_url=True,
         ).to_dict()
-        entry_name = self._resolve_unique_name(normalized["name"])
+        entry_name = self._resolve_unique_name(normalized["name"], taken)
         return {
             "name": entry_name,
             "url": normalized["url"],
@@ -218,73 +300,67 @@ class APIEntryManager:
             "keywords": normalized["keywords"] or [entry_name],
             "valid": normalized["valid"],
             "site": normalized["site"],
+            "cache": normalized["cache"],
+            "fanout": normalized["fanout"],
         }
 
     def _update_one(
         self,
+        draft: PoolDraft,
         name: str,
         payload: dict[str, Any],
         *,
         resolve_site_name: Callable[[str], str] | None = None,
     ) -> dict[str, Any]:
-        idx_cfg, idx_entry = self._find_index(name)
-        if idx_cfg < 0 or idx_entry < 0:
+        row = draft.get_row(name)
+        if row is None:
             raise LookupError(f"api not found: {name}")
-        data = dict(self.pool[idx_cfg])
+        data = dict(row)
         data.update(payload)
         new_name = str(data.get("name", "")).strip()
-        duplicate = self.get_entry(new_name)
-        if new_name != name and duplicate:
+        if new_name != name and new_name in draft:
             raise ValueError(f"api name already exists: {new_name}")
         normalized = self.normalize_payload(
             data,
             require_unique_name=False,
             resolve_site_name=resolve_site_name,
         )
-        self.pool[idx_cfg] = normalized
-        self.entries[idx_entry] = APIEntry(normalized)
+        draft.replace(name, APIEntry(normalized), normalized)
         return dict(normalized)
 
     def sync_site_fields(self, resolve_site_name: Callable[[str], str]) -> bool:
-        changed = False
         changed_rows: list[dict[str, Any]] = []
-        for index, api_cfg in enumerate(self.pool):
+        draft = self._snapshot.draft()
+        for api_cfg in self._snapshot.rows:
             if not isinstance(api_cfg, dict):
                 continue
             next_site = str(resolve_site_name(str(api_cfg.get("url", "")))).strip()
             if str(api_cfg.get("site", "")).strip() == next_site:
                 continue
-            api_cfg["site"] = next_site
-            if index < len(self.entries):
-                self.entries[index] = APIEntry(dict(api_cfg))
-            changed_rows.append(dict(api_cfg))
-            changed = True
-        if changed:
-            self.db.batch_update_api_pool(upserts=changed_rows)
-        return changed
+            row = dict(api_cfg)
+            row["site"] = next_site
+            entry = APIEntry(row)
+            # Only the site field changed; keyword/scope indexes still hold.
+            draft.replace(entry.name, entry, row, reindex=False)
+            changed_rows.append(dict(row))
+        if not changed_rows:
+            return False
+        self._publish(draft)
+        self.db.batch_update_api_pool(upserts=changed_rows)
+        return True
 
     def remove_entries(self, names: list[str]) -> tuple[list[str], list[str]]:
-        success: list[str] = []
-        failed: list[str] = []
-
-        remaining_entries: list[APIEntry] = []
-        remaining_configs: list[dict[str, Any]] = []
         name_set = set(names)
+        success = [
+            entry.name for entry in self._snapshot.entries if entry.name in name_set
+        ]
+        removed = set(success)
+        failed = [name for name in names if name not in removed]
 
-        for entry, cfg in zip(self.entries, self.pool):
-            if entry.name in name_set:
-                success.append(entry.name)
-            else:
-                remaining_entries.append(entry)
-                remaining_configs.append(cfg)
-
-        for name in names:
-            if name not in success:
-                failed.append(name)
-
-        self.entries[:] = remaining_entries
-        self.pool[:] = remaining_configs
         if success:
+            draft = self._snapshot.draft()
+            draft.remove(removed)
+            self._publish(draft)
             self.db.batch_update_api_pool(delete_names=success)
         return success, failed
 
@@ -296,14 +372,16 @@ class APIEntryManager:
         emit_changed: bool = True,
     ) -> list[APIEntry]:
         created: list[APIEntry] = []
+        draft = self._snapshot.draft()
         for payload in payloads:
             if not isinstance(payload, dict):
                 raise ValueError("payload item must be an object")
-            full_data = self._build_entry_data(payload)
+            full_data = self._build_entry_data(payload, draft)
             entry = APIEntry(full_data)
-            self.entries.append(entry)
-            self.pool.append(full_data)
+            draft.append(entry, full_data)
             created.append(entry)
+        if created:
+            self._publish(draft)
         if save and created:
             self.db.batch_update_api_pool(
                 upserts=[entry.to_dict() for entry in created]
@@ -318,6 +396,7 @@ class APIEntryManager:
         save: bool = True,
     ) -> list[dict[str, Any]]:
         changed: list[dict[str, Any]] = []
+        draft = self._snapshot.draft()
         for item in updates:
             if not isinstance(item, dict):
                 raise ValueError("update item must be an object")
@@ -329,61 +408,70 @@ class APIEntryManager:
                 raise ValueError("update item requires object payload")
             changed.append(
                 self._update_one(
+                    draft,
                     name,
                     payload,
                     resolve_site_name=resolve_site_name,
                 )
             )
+        if changed:
+            self._publish(draft)
         if save and changed:
-            self.db.batch_update_api_pool(upserts=changed)
+            # Renamed entries leave their old row behind.
+            self.db.batch_update_api_pool(
+                upserts=changed,
+                delete_names=sorted(draft.removed),
+            )
         return changed
 
+    def _commit_entry(self, entry: APIEntry, field: str) -> None:
+        """Publish an edited copy of a stored entry and persist it."""
+        draft = self._snapshot.draft()
+        row = dict(draft.get_row(entry.name) or entry.to_dict())
+        row[field] = list(getattr(entry, field))
+        draft.replace(entry.name, entry, row)
+        self._publish(draft)
+        self.db.batch_update_api_pool(upserts=[entry.to_dict()])
+
     def add_scope_to_entry(self, name: str, scope: str) -> bool:
         entry = self.get_entry(name)
         if not entry:
             return False
-        changed = entry.add_scope(scope)
-        if changed:
-            idx_cfg, _ = self._find_index(name)
-            if idx_cfg >= 0:
-                self.pool[idx_cfg]["scope"] = list(entry.scope)
-            self.db.batch_update_api_pool(upserts=[entry.to_dict()])
+        entry = entry.replace()
+        if entry.add_scope(scope):
+            self._commit_entry(entry, "scope")
         return True
 
     def remove_scope_from_entry(self, name: str, scope: str) -> bool:
         entry = self.get_entry(name)
         if not entry:
             return False
-        changed = entry.remove_scope(scope)
-        if changed:
-            idx_cfg, _ = self._find_index(name)
-            if idx_cfg >= 0:
-                self.pool[idx_cfg]["scope"] = list(entry.scope)
-            self.db.batch_update_api_pool(upserts=[entry.to_dict()])
+        entry = entry.replace()
+        if entry.remove_scope(scope):
+            self._commit_entry(entry, "scope")
         return True
 
     def update_keywords(self, name: str, keywords: list[str]) -> bool:
         entry = self.get_entry(name)
         if not entry:
             return False
+        entry = entry.replace()
         entry.set_keywords(keywords)
-        idx_cfg, _ = self._find_index(name)
-        if idx_cfg >= 0:
-            self.pool[idx_cfg]["keywords"] = list(entry.keywords)
-        self.db.batch_update_api_pool(upserts=[entry.to_dict()])
+        self._commit_entry(entry, "keywords")
         return True
 
     def display_entries(self) -> str:
-        if not self.entries:
+        entries = self._snapshot.entries
+        if not entries:
             return "No API entries registered."
         api_types: dict[str, list[APIEntry]] = {t: [] for t in DataType.values()}
         api_types.setdefault("unknown", [])
-        for entry in self.entries:
+        for entry in entries:
             api_type = entry.type or "unknown"
             api_types.setdefault(api_type, [])
             api_types[api_type].append(entry)
 
-        lines = [f"---- total {len(self.entries)} APIs ----", ""]
+        lines = [f"---- total {len(entries)} APIs ----", ""]
         for api_type, items in api_types.items():
             if not items:
                 continue
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from collections.abc import Iterable
+
+
+class KeywordMatcher:
+    """Multi-pattern keyword matcher shared by all API entries.
+
+    Keywords keep `re.search` semantics. Plain literal keywords are compiled
+    into one Aho-Corasick automaton so a single pass over the text finds every
+    owner; keywords that use regex syntax stay in a small fallback tier that is
+    still searched one pattern at a time.
+
+    Commands usually equal one of the literal keywords verbatim, so the literal
+    tier result for every keyword is also precomputed into a hash table and
+    such commands skip the automaton walk entirely.
+
+    Owner tables are updated incrementally; the automaton is rebuilt by
+    `compile` (or lazily on the first match after a change). `copy` clones the
+    owner tables so a new pool snapshot can be updated without touching the
+    matcher that readers of the previous snapshot still use.
+    """
+
+    REGEX_META = frozenset(".^$*+?{}[]\\|()")
+
+    def __init__(self) -> None:
+        self._owner_keywords: dict[str, tuple[str, ...]] = {}
+        self._literals: dict[str, set[str]] = {}
+        self._patterns: dict[str, tuple[re.Pattern, set[str]]] = {}
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._outputs: list[frozenset[str]] = [frozenset()]
+        self._exact: dict[str, frozenset[str]] = {}
+        self._dirty = False
+
+    @classmethod
+    def is_literal(cls, keyword: str) -> bool:
+        """Whether the keyword matches itself verbatim when used as a regex."""
+        return not any(ch in cls.REGEX_META for ch in keyword)
+
+    # =============== Owner maintenance ===================
+
+    def add(self, owner: str, keywords: Iterable[str]) -> None:
+        if owner in self._owner_keywords:
+            self.remove(owner)
+        unique = tuple(dict.fromkeys(k for k in keywords if k and k.strip()))
+        self._owner_keywords[owner] = unique
+        for keyword in unique:
+            if self.is_literal(keyword):
+                self._literals.setdefault(keyword, set()).add(owner)
+                self._dirty = True
+                continue
+            slot = self._patterns.get(keyword)
+            if slot is None:
+                try:
+                    slot = (re.compile(keyword), set())
+                except re.error:
+                    # APIEntry already logs invalid patterns.
+                    continue
+                self._patterns[keyword] = slot
+            slot[1].add(owner)
+
+    def remove(self, owner: str) -> None:
+        keywords = self._owner_keywords.pop(owner, ())
+        for keyword in keywords:
+            owners = self._literals.get(keyword)
+            if owners is not None:
+                owners.discard(owner)
+                if not owners:
+                    self._literals.pop(keyword, None)
+                self._dirty = True
+                continue
+            slot = self._patterns.get(keyword)
+            if slot is not None:
+                slot[1].discard(owner)
+                if not slot[1]:
+                    self._patterns.pop(keyword, None)
+
+    def clear(self) -> None:
+        self._owner_keywords.clear()
+        self._literals.clear()
+        self._patterns.clear()
+        self._dirty = True
+
+    def copy(self) -> KeywordMatcher:
+        clone = KeywordMatcher()
+        clone._owner_keywords = dict(self._owner_keywords)
+        clone._literals = {k: set(v) for k, v in self._literals.items()}
+        clone._patterns = {
+            k: (pattern, set(owners))
+            for k, (pattern, owners) in self._patterns.items()
+        }
+        # The compiled automaton is never mutated, only replaced, so the clone
+        # can share it until its own tables change.
+        clone._goto = self._goto
+        clone._outputs = self._outputs
+        clone._exact = self._exact
+        clone._dirty = self._dirty
+        return clone
+
+    def compile(self) -> None:
+        """Rebuild the automaton now if the literal tier changed."""
+        if self._dirty:
+            self._build()
+
+    # =============== Automaton ===================
+
+    def _build(self) -> None:
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[set[str]] = [set()]
+        for keyword, owners in self._literals.items():
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append(set())
+                state = nxt
+            outputs[state].update(owners)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                candidate = goto[link].get(ch, 0)
+                fail[nxt] = candidate if candidate != nxt else 0
+                outputs[nxt] |= outputs[fail[nxt]]
+
+        # Fold non-root failure transitions into each state (BFS order keeps
+        # the source tables complete), so matching never walks the failure
+        # chain: a miss falls straight back to the root table.
+        order = deque(goto[0].values())
+        while order:
+            state = order.popleft()
+            for nxt in goto[state].values():
+                order.append(nxt)
+            if fail[state] == 0:
+                continue
+            for ch, target in goto[fail[state]].items():
+                goto[state].setdefault(ch, target)
+
+        self._goto = goto
+        self._outputs = [frozenset(item) for item in outputs]
+        self._exact = {
+            keyword: frozenset(self._walk(keyword)) for keyword in self._literals
+        }
+        self._dirty = False
+
+    # =============== Matching ===================
+
+    def _walk(self, text: str) -> set[str]:
+        hits: set[str] = set()
+        goto = self._goto
+        outputs = self._outputs
+        root = goto[0]
+        state = 0
+        for ch in text:
+            state = goto[state].get(ch) or root.get(ch, 0)
+            if outputs[state]:
+                hits |= outputs[state]
+        return hits
+
+    def match(self, text: str) -> set[str]:
+        """Return owners with at least one keyword found in `text`."""
+        if self._dirty:
+            self._build()
+        exact = self._exact.get(text)
+        hits = set(exact) if exact is not None else self._walk(text)
+        for pattern, owners in self._patterns.values():
+            if not owners <= hits and pattern.search(text):
+                hits |= owners
+        return hits
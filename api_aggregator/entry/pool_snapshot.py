@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+from typing import Any, Generic, TypeVar
+
+from .keyword_matcher import KeywordMatcher
+from .scope_index import ScopeIndex
+
+EntryT = TypeVar("EntryT")
+
+
+class PoolSnapshot(Generic[EntryT]):
+    """Immutable, self-consistent view of an entry pool.
+
+    Managers never mutate a published snapshot: every change is staged on a
+    `PoolDraft` and the resulting snapshot replaces the old one with a single
+    reference assignment. Readers that grab `manager.snapshot` once therefore
+    see entries, rows and indexes from the same generation, even while other
+    coroutines keep mutating the manager.
+    """
+
+    __slots__ = ("generation", "entries", "rows", "by_name", "positions")
+
+    def __init__(
+        self,
+        entries: Iterable[EntryT],
+        rows: Iterable[dict[str, Any]],
+        *,
+        generation: int = 0,
+    ) -> None:
+        self.generation = generation
+        self.entries: tuple[EntryT, ...] = tuple(entries)
+        self.rows: tuple[dict[str, Any], ...] = tuple(rows)
+        # `entries` and `rows` are kept in the same order, so one position
+        # index serves both.
+        self.by_name: Mapping[str, EntryT] = MappingProxyType(
+            {entry.name: entry for entry in self.entries}  # type: ignore[attr-defined]
+        )
+        self.positions: Mapping[str, int] = MappingProxyType(
+            {entry.name: i for i, entry in enumerate(self.entries)}  # type: ignore[attr-defined]
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def draft(self) -> PoolDraft[EntryT]:
+        return PoolDraft(self)
+
+    def evolve(self, draft: PoolDraft[EntryT]) -> PoolSnapshot[EntryT]:
+        return type(self)(draft.entries, draft.rows, generation=self.generation + 1)
+
+
+class APIPoolSnapshot(PoolSnapshot):
+    """API pool snapshot that also owns the compiled match indexes."""
+
+    __slots__ = ("matcher", "scope_index")
+
+    def __init__(
+        self,
+        entries: Iterable[Any],
+        rows: Iterable[dict[str, Any]],
+        *,
+        generation: int = 0,
+        matcher: KeywordMatcher | None = None,
+        scope_index: ScopeIndex | None = None,
+    ) -> None:
+        super().__init__(entries, rows, generation=generation)
+        if matcher is None or scope_index is None:
+            matcher = KeywordMatcher()
+            scope_index = ScopeIndex()
+            for entry in self.entries:
+                matcher.add(entry.name, entry.keywords)
+                scope_index.add(entry.name, entry.scope)
+        # Compile before publishing so the match path never writes to a
+        # shared snapshot.
+        matcher.compile()
+        self.matcher = matcher
+        self.scope_index = scope_index
+
+    def evolve(self, draft: PoolDraft) -> APIPoolSnapshot:
+        """Build the next snapshot, updating copies of the indexes in place."""
+        matcher = self.matcher.copy()
+        scope_index = self.scope_index.copy()
+        for name in draft.removed:
+            matcher.remove(name)
+            scope_index.remove(name)
+        for entry in draft.upserts.values():
+            matcher.add(entry.name, entry.keywords)
+            scope_index.add(entry.name, entry.scope)
+        return APIPoolSnapshot(
+            draft.entries,
+            draft.rows,
+            generation=self.generation + 1,
+            matcher=matcher,
+            scope_index=scope_index,
+        )
+
+
+class PoolDraft(Generic[EntryT]):
+    """Mutable working copy of a snapshot for one batch of changes."""
+
+    def __init__(self, base: PoolSnapshot[EntryT]) -> None:
+        self.base = base
+        self.entries: list[EntryT] = list(base.entries)
+        self.rows: list[dict[str, Any]] = list(base.rows)
+        self.positions: dict[str, int] = dict(base.positions)
+        # Entries whose keywords/scope must be (re)indexed, and names that
+        # left the pool.
+        self.upserts: dict[str, EntryT] = {}
+        self.removed: set[str] = set()
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.upserts or self.removed)
+
+    def get(self, name: str) -> EntryT | None:
+        index = self.positions.get(name)
+        return None if index is None else self.entries[index]
+
+    def get_row(self, name: str) -> dict[str, Any] | None:
+        index = self.positions.get(name)
+        return None if index is None else self.rows[index]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.positions
+
+    def append(self, entry: EntryT, row: dict[str, Any]) -> None:
+        name = entry.name  # type: ignore[attr-defined]
+        self.positions[name] = len(self.entries)
+        self.entries.append(entry)
+        self.rows.append(row)
+        self.upserts[name] = entry
+        self.removed.discard(name)
+
+    def replace(
+        self,
+        name: str,
+        entry: EntryT,
+        row: dict[str, Any],
+        *,
+        reindex: bool = True,
+    ) -> None:
+        """Swap the entry stored under `name`, keeping its position."""
+        index = self.positions[name]
+        new_name = entry.name  # type: ignore[attr-defined]
+        self.entries[index] = entry
+        self.rows[index] = row
+        if new_name != name:
+            self.positions.pop(name)
+            self.positions[new_name] = index
+            self.upserts.pop(name, None)
+            self.removed.add(name)
+            reindex = True
+        if reindex or name in self.upserts:
+            self.upserts[new_name] = entry
+            self.removed.discard(new_name)
+
+    def remove(self, names: set[str]) -> None:
+        if not names:
+            return
+        kept = [
+            (entry, row)
+            for entry, row in zip(self.entries, self.rows)
+            if entry.name not in names  # type: ignore[attr-defined]
+        ]
+        self.entries = [entry for entry, _ in kept]
+        self.rows = [row for _, row in kept]
+        self.positions = {
+            entry.name: i  # type: ignore[attr-defined]
+            for i, entry in enumerate(self.entries)
+        }
+        for name in names:
+            self.upserts.pop(name, None)
+        self.removed |= names
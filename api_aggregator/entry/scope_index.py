@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+
+class ScopeIndex:
+    """Inverted index from scope value to the entries restricted to it.
+
+    An entry without scope is open to every caller, otherwise one of its scope
+    values must equal the caller's user, group or session id, or be `admin`
+    for admin callers.
+    """
+
+    ADMIN_SCOPE = "admin"
+
+    def __init__(self) -> None:
+        self._owner_scope: dict[str, tuple[str, ...]] = {}
+        self._by_scope: dict[str, set[str]] = {}
+        self._unscoped: set[str] = set()
+
+    def add(self, owner: str, scope: Iterable[str]) -> None:
+        if owner in self._owner_scope:
+            self.remove(owner)
+        values = tuple(dict.fromkeys(s for s in scope if s))
+        self._owner_scope[owner] = values
+        if not values:
+            self._unscoped.add(owner)
+            return
+        for value in values:
+            self._by_scope.setdefault(value, set()).add(owner)
+
+    def remove(self, owner: str) -> None:
+        values = self._owner_scope.pop(owner, None)
+        if values is None:
+            return
+        self._unscoped.discard(owner)
+        for value in values:
+            owners = self._by_scope.get(value)
+            if owners is None:
+                continue
+            owners.discard(owner)
+            if not owners:
+                self._by_scope.pop(value, None)
+
+    def clear(self) -> None:
+        self._owner_scope.clear()
+        self._by_scope.clear()
+        self._unscoped.clear()
+
+    def copy(self) -> ScopeIndex:
+        clone = ScopeIndex()
+        clone._owner_scope = dict(self._owner_scope)
+        clone._by_scope = {k: set(v) for k, v in self._by_scope.items()}
+        clone._unscoped = set(self._unscoped)
+        return clone
+
+    def filter(
+        self,
+        owners: set[str],
+        *,
+        user_id: str,
+        group_id: str,
+        session_id: str,
+        is_admin: bool,
+    ) -> set[str]:
+        """Return the subset of `owners` the caller is allowed to trigger."""
+        allowed = owners & self._unscoped
+        keys = [user_id, group_id, session_id]
+        if is_admin:
+            keys.append(self.ADMIN_SCOPE)
+        for key in keys:
+            scoped = self._by_scope.get(key)
+            if scoped:
+                allowed |= owners & scoped
+        return allowed
@@ -20,6 +20,8 @@ class SiteEntry:
         self.headers = dict(normalized.headers)
         self.keys = dict(normalized.keys)
         self.timeout = normalized.timeout
+        self.connector = normalized.connector
+        self.limits = normalized.limits
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -29,6 +31,8 @@ class SiteEntry:
             "headers": dict(self.headers),
             "keys": dict(self.keys),
             "timeout": self.timeout,
+            "connector": self.connector.to_dict(),
+            "limits": self.limits.to_dict(),
         }
 
     def is_vested(self, full_url: str):
@@ -1,24 +1,50 @@
 from __future__ import annotations
 
+from collections.abc import Container
 from typing import Any
 
 from ..database import SQLiteDatabase
 from ..log import logger
 from ..model import SitePayload
+from .pool_snapshot import PoolDraft, PoolSnapshot
 from .site_entry import SiteEntry
 
 
 class SiteEntryManager:
-    """Manage site entries and persistence mapping."""
+    """Manage site entries and persistence mapping.
+
+    Like `APIEntryManager`, the pool is published as an immutable
+    `PoolSnapshot` that each mutation replaces in one assignment.
+    """
 
     def __init__(self, db: SQLiteDatabase):
         self.db = db
-        self.pool = self.db.site_pool
-        self.entries: list[SiteEntry] = []
+        self._snapshot: PoolSnapshot[SiteEntry] = PoolSnapshot((), ())
+        self._suffix_hints: dict[str, int] = {}
+
+    @property
+    def snapshot(self) -> PoolSnapshot[SiteEntry]:
+        """Current pool snapshot; never mutated once published."""
+        return self._snapshot
+
+    @property
+    def entries(self) -> tuple[SiteEntry, ...]:
+        return self._snapshot.entries
+
+    @property
+    def pool(self) -> tuple[dict[str, Any], ...]:
+        return self._snapshot.rows
+
+    def _publish(self, draft: PoolDraft[SiteEntry]) -> None:
+        if draft.base is not self._snapshot:
+            raise RuntimeError("site pool changed while a draft was open")
+        self._snapshot = self._snapshot.evolve(draft)
 
     async def initialize(self) -> None:
         # Support restart: rebuild in-memory entries from current pool state.
-        stored_entries = [dict(item) for item in self.pool if isinstance(item, dict)]
+        stored_entries = [
+            dict(item) for item in self.db.site_pool if isinstance(item, dict)
+        ]
         old_names = [
             str(item.get("name", "")).strip()
             for item in stored_entries
@@ -45,8 +71,12 @@ class SiteEntryManager:
             loaded.append(entry)
             normalized_rows.append(normalized)
 
-        self.entries[:] = loaded
-        self.pool[:] = normalized_rows
+        self._suffix_hints.clear()
+        self._snapshot = PoolSnapshot(
+            loaded,
+            normalized_rows,
+            generation=self._snapshot.generation + 1,
+        )
 
         # Persist only when load phase fixed/removed invalid rows.
         if dirty:
@@ -55,29 +85,22 @@ class SiteEntryManager:
                 delete_names=old_names,
             )
 
-    def _resolve_unique_name(self, name: str) -> str:
-        if not self.get_entry(name):
+    def _resolve_unique_name(
+        self, name: str, taken: Container[str] | None = None
+    ) -> str:
+        taken = self._snapshot.by_name if taken is None else taken
+        if name not in taken:
             return name
-        index = 2
+        # Resume from the last suffix handed out so bulk imports of the same
+        # name stay linear.
+        index = self._suffix_hints.get(name, 2)
         while True:
             new_name = f"{name}_{index}"
-            if not self.get_entry(new_name):
+            if new_name not in taken:
+                self._suffix_hints[name] = index + 1
                 return new_name
             index += 1
 
-    def _find_index(self, name: str) -> tuple[int, int]:
-        cfg_idx = -1
-        entry_idx = -1
-        for i, item in enumerate(self.pool):
-            if item.get("name") == name:
-                cfg_idx = i
-                break
-        for i, entry in enumerate(self.entries):
-            if entry.name == name:
-                entry_idx = i
-                break
-        return cfg_idx, entry_idx
-
     @staticmethod
     def _normalize_payload(data: dict[str, Any]) -> dict[str, Any]:
         normalized = SitePayload.from_raw(
@@ -89,13 +112,15 @@ class SiteEntryManager:
         normalized.pop("__template_key", None)
         return normalized
 
-    def _build_entry_data(self, data: dict[str, Any]) -> dict[str, Any]:
+    def _build_entry_data(
+        self, data: dict[str, Any], taken: Container[str] | None = None
+    ) -> dict[str, Any]:
         payload = SitePayload.from_raw(
             data,
             require_name=True,
             require_url=True,
         ).to_dict()
-        entry_name = self._resolve_unique_name(payload["name"])
+        entry_name = self._resolve_unique_name(payload["name"], taken)
         return {
             "name": entry_name,
             "url": payload["url"],
@@ -103,6 +128,8 @@ class SiteEntryManager:
             "headers": payload["headers"],
             "keys": payload["keys"],
             "timeout": payload["timeout"],
+            "connector": payload["connector"],
+            "limits": payload["limits"],
         }
 
     def add_entries(
@@ -114,14 +141,15 @@ class SiteEntryManager:
         if not isinstance(payloads, list) or not payloads:
             raise ValueError("payloads must be a non-empty list")
         created: list[SiteEntry] = []
+        draft = self._snapshot.draft()
         for raw in payloads:
             if not isinstance(raw, dict):
                 raise ValueError("payload item must be an object")
-            full_data = self._build_entry_data(raw)
+            full_data = self._build_entry_data(raw, draft)
             entry = SiteEntry(full_data)
-            self.entries.append(entry)
-            self.pool.append(full_data)
+            draft.append(entry, full_data)
             created.append(entry)
+        self._publish(draft)
         if save and created:
             self.db.batch_update_site_pool(
                 upserts=[entry.to_dict() for entry in created]
@@ -130,26 +158,22 @@ class SiteEntryManager:
 
     def _update_entry(
         self,
+        draft: PoolDraft[SiteEntry],
         name: str,
         payload: dict[str, Any],
-        *,
-        save: bool,
     ) -> dict[str, Any]:
-        idx_cfg, idx_entry = self._find_index(name)
-        if idx_cfg < 0 or idx_entry < 0:
+        row = draft.get_row(name)
+        if row is None:
             raise LookupError(f"site not found: {name}")
 
-        data = dict(self.pool[idx_cfg])
+        data = dict(row)
         data.update(payload)
         normalized = self._normalize_payload(data)
         new_name = str(normalized.get("name", ""))
-        if new_name != name and self.get_entry(new_name):
+        if new_name != name and new_name in draft:
             raise ValueError(f"site name already exists: {new_name}")
 
-        self.pool[idx_cfg] = normalized
-        self.entries[idx_entry] = SiteEntry(normalized)
-        if save:
-            self.db.batch_update_site_pool(upserts=[normalized])
+        draft.replace(name, SiteEntry(normalized), normalized)
         return dict(normalized)
 
     def update_entries(
@@ -159,6 +183,7 @@ class SiteEntryManager:
         save: bool = True,
     ) -> list[dict[str, Any]]:
         changed: list[dict[str, Any]] = []
+        draft = self._snapshot.draft()
         for item in updates:
             if not isinstance(item, dict):
                 raise ValueError("update item must be an object")
@@ -168,9 +193,15 @@ class SiteEntryManager:
                 raise ValueError("update item requires name")
             if not isinstance(payload, dict):
                 raise ValueError("update item requires object payload")
-            changed.append(self._update_entry(name, payload, save=False))
+            changed.append(self._update_entry(draft, name, payload))
+        if changed:
+            self._publish(draft)
         if save and changed:
-            self.db.batch_update_site_pool(upserts=changed)
+            # Renamed entries leave their old row behind.
+            self.db.batch_update_site_pool(
+                upserts=changed,
+                delete_names=sorted(draft.removed),
+            )
         return changed
 
     def remove_entries(
@@ -181,17 +212,21 @@ class SiteEntryManager:
     ) -> tuple[list[str], list[str]]:
         success: list[str] = []
         failed: list[str] = []
+        removed: set[str] = set()
+        by_name = self._snapshot.by_name
         for name in names:
             normalized = str(name or "").strip()
             if not normalized:
                 continue
-            idx_cfg, idx_entry = self._find_index(normalized)
-            if idx_cfg >= 0 and idx_entry >= 0:
-                self.pool.pop(idx_cfg)
-                self.entries.pop(idx_entry)
+            if normalized in by_name and normalized not in removed:
+                removed.add(normalized)
                 success.append(normalized)
             else:
                 failed.append(normalized)
+        if success:
+            draft = self._snapshot.draft()
+            draft.remove(removed)
+            self._publish(draft)
         if save and success:
             self.db.batch_update_site_pool(delete_names=success)
         return success, failed
@@ -216,19 +251,16 @@ class SiteEntryManager:
         return result
 
     def get_entry(self, name: str) -> SiteEntry | None:
-        for entry in self.entries:
-            if entry.name == name:
-                return entry
-        return None
+        return self._snapshot.by_name.get(name)
 
     def list_entries(self) -> list[SiteEntry]:
-        return list(self.entries)
+        return list(self._snapshot.entries)
 
     def list_enabled_entries(self) -> list[SiteEntry]:
-        return [entry for entry in self.entries if entry.enabled]
+        return [entry for entry in self._snapshot.entries if entry.enabled]
 
     def list_disabled_entries(self) -> list[SiteEntry]:
-        return [entry for entry in self.entries if not entry.enabled]
+        return [entry for entry in self._snapshot.entries if not entry.enabled]
 
     def match_entry(
         self,
@@ -236,8 +268,9 @@ class SiteEntryManager:
         *,
         only_enabled: bool = True,
     ) -> SiteEntry | None:
-        candidates = self.list_enabled_entries() if only_enabled else self.entries
-        for entry in candidates:
+        for entry in self._snapshot.entries:
+            if only_enabled and not entry.enabled:
+                continue
             if entry.is_vested(full_url):
                 return entry
         return None
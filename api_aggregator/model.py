@@ -1,5 +1,6 @@
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Any
@@ -39,6 +40,17 @@ class FieldCaster:
             return [text] if text else list(default or [])
         return list(default or [])
 
+    @staticmethod
+    def to_optional_number(value: Any, cast: Callable[[Any], Any] = int) -> Any:
+        """Cast to a non-negative number; blank or invalid values become `None`."""
+        if value is None or value == "":
+            return None
+        try:
+            number = cast(value)
+        except (TypeError, ValueError):
+            return None
+        return number if number >= 0 else None
+
     @staticmethod
     def normalize_name(value: Any) -> str:
         return str(value or "").strip()
@@ -149,6 +161,146 @@ class UpdateItemsBatch:
         return cls(items=[UpdateItem.from_raw(item) for item in raw_items])
 
 
+@dataclass(frozen=True)
+class ConnectorOptions:
+    """HTTP connection pool settings; `None` fields inherit the defaults."""
+
+    max_connections: int | None = None
+    max_connections_per_host: int | None = None
+    keepalive_timeout: float | None = None
+    dns_cache_ttl: int | None = None
+
+    @classmethod
+    def from_raw(cls, payload: Any) -> "ConnectorOptions":
+        data = payload if isinstance(payload, dict) else {}
+        to_number = FieldCaster.to_optional_number
+        return cls(
+            max_connections=to_number(data.get("max_connections")),
+            max_connections_per_host=to_number(data.get("max_connections_per_host")),
+            keepalive_timeout=to_number(data.get("keepalive_timeout"), float),
+            dns_cache_ttl=to_number(data.get("dns_cache_ttl")),
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.to_dict()
+
+    def merged(self, overrides: "ConnectorOptions") -> "ConnectorOptions":
+        """Return these options with the set fields of `overrides` applied."""
+        return ConnectorOptions(**{**self.to_dict(), **overrides.to_dict()})
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            key: value
+            for key, value in {
+                "max_connections": self.max_connections,
+                "max_connections_per_host": self.max_connections_per_host,
+                "keepalive_timeout": self.keepalive_timeout,
+                "dns_cache_ttl": self.dns_cache_ttl,
+            }.items()
+            if value is not None
+        }
+
+
+@dataclass(frozen=True)
+class SiteLimitOptions:
+    """Per-site request limits; `None` fields inherit the defaults."""
+
+    max_in_flight: int | None = None
+    rate_per_second: float | None = None
+    burst: int | None = None
+    max_response_mb: float | None = None
+
+    @classmethod
+    def from_raw(cls, payload: Any) -> "SiteLimitOptions":
+        data = payload if isinstance(payload, dict) else {}
+        to_number = FieldCaster.to_optional_number
+        return cls(
+            max_in_flight=to_number(data.get("max_in_flight")),
+            rate_per_second=to_number(data.get("rate_per_second"), float),
+            burst=to_number(data.get("burst")),
+            max_response_mb=to_number(data.get("max_response_mb"), float),
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.to_dict()
+
+    def merged(self, overrides: "SiteLimitOptions") -> "SiteLimitOptions":
+        """Return these options with the set fields of `overrides` applied."""
+        return SiteLimitOptions(**{**self.to_dict(), **overrides.to_dict()})
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            key: value
+            for key, value in {
+                "max_in_flight": self.max_in_flight,
+                "rate_per_second": self.rate_per_second,
+                "burst": self.burst,
+                "max_response_mb": self.max_response_mb,
+            }.items()
+            if value is not None
+        }
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Response cache policy of a text API; empty means no caching.
+
+    `ttl` keeps a response for that many seconds, `reset_at` ("HH:MM", local
+    time) expires it at the next daily reset. With both set, whichever comes
+    first wins.
+    """
+
+    ttl: int | None = None
+    reset_at: str | None = None
+
+    @classmethod
+    def from_raw(cls, payload: Any) -> "CachePolicy":
+        data = payload if isinstance(payload, dict) else {}
+        ttl = FieldCaster.to_optional_number(data.get("ttl"))
+        return cls(
+            ttl=ttl if ttl and ttl > 0 else None,
+            reset_at=cls._normalize_clock(data.get("reset_at")),
+        )
+
+    @staticmethod
+    def _normalize_clock(value: Any) -> str | None:
+        text = str(value or "").strip()
+        if not text:
+            return None
+        try:
+            parsed = datetime.strptime(text, "%H:%M")
+        except ValueError:
+            return None
+        return parsed.strftime("%H:%M")
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.to_dict()
+
+    def expires_at(self, now: float) -> float:
+        """Expiry timestamp of a response cached at `now`."""
+        candidates: list[float] = []
+        if self.ttl:
+            candidates.append(now + self.ttl)
+        if self.reset_at:
+            current = datetime.fromtimestamp(now)
+            hour, minute = map(int, self.reset_at.split(":"))
+            reset = current.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if reset <= current:
+                reset += timedelta(days=1)
+            candidates.append(reset.timestamp())
+        return min(candidates) if candidates else now
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            key: value
+            for key, value in {"ttl": self.ttl, "reset_at": self.reset_at}.items()
+            if value is not None
+        }
+
+
 @dataclass(frozen=True)
 class SitePayload:
     name: str
@@ -157,6 +309,8 @@ class SitePayload:
     headers: dict[str, Any]
     keys: dict[str, Any]
     timeout: int
+    connector: ConnectorOptions = ConnectorOptions()
+    limits: SiteLimitOptions = SiteLimitOptions()
 
     @classmethod
     def from_raw(
@@ -180,6 +334,8 @@ class SitePayload:
             headers=FieldCaster.to_dict(data.get("headers")),
             keys=FieldCaster.to_dict(data.get("keys")),
             timeout=int(data.get("timeout", 60)),
+            connector=ConnectorOptions.from_raw(data.get("connector")),
+            limits=SiteLimitOptions.from_raw(data.get("limits")),
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -190,6 +346,8 @@ class SitePayload:
             "headers": dict(self.headers),
             "keys": dict(self.keys),
             "timeout": self.timeout,
+            "connector": self.connector.to_dict(),
+            "limits": self.limits.to_dict(),
         }
 
 
@@ -205,6 +363,8 @@ class ApiPayload:
     keywords: list[str]
     valid: bool
     site: str
+    cache: CachePolicy = CachePolicy()
+    fanout: int = 1
 
     @classmethod
     def from_raw(
@@ -240,6 +400,8 @@ class ApiPayload:
             keywords=keywords or ([name] if name else []),
             valid=FieldCaster.to_bool(data.get("valid"), default=True),
             site=FieldCaster.normalize_name(site_name),
+            cache=CachePolicy.from_raw(data.get("cache")),
+            fanout=max(1, FieldCaster.to_optional_number(data.get("fanout")) or 1),
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -254,6 +416,8 @@ class ApiPayload:
             "keywords": list(self.keywords),
             "valid": self.valid,
             "site": self.site,
+            "cache": self.cache.to_dict(),
+            "fanout": self.fanout,
         }
 
 
@@ -316,7 +480,7 @@ class DataType(str, Enum):
     def get_default_ext(self) -> str:
         """Return default file extension."""
         return {
-            DataType.TEXT: ".json",
+            DataType.TEXT: ".jsonl",
             DataType.IMAGE: ".jpg",
             DataType.VIDEO: ".mp4",
             DataType.AUDIO: ".mp3",
@@ -343,6 +507,10 @@ class DataResource:
     saved_path: Path | None = None
     is_duplicate: bool = False
 
+    # Handles of one coalesced fetch share this holder count, so `unlink`
+    # only deletes the file once every holder has released it.
+    _holders: list[int] | None = field(default=None, repr=False, compare=False)
+
     @property
     def final_text(self) -> str | None:
         return self.saved_text or self.text
@@ -362,8 +530,19 @@ class DataResource:
         if self.text and self.binary:
             raise ValueError("Cannot provide text and binary at the same time")
 
+    def share(self, count: int) -> list["DataResource"]:
+        """Split into `count` handles of the same saved data."""
+        holders = [count]
+        return [replace(self, _holders=holders) for _ in range(count)]
+
     def unlink(self) -> None:
         """Delete saved data and clear linkage."""
+        if self._holders is not None:
+            holders, self._holders = self._holders, None
+            holders[0] -= 1
+            if holders[0] > 0:
+                self.saved_path = None
+                return
         if self.saved_path and self.saved_path.exists():
             try:
                 self.saved_path.unlink()
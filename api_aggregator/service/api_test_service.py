@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import copy
 import time
 from collections.abc import AsyncIterator, Callable
 from typing import Any
@@ -8,7 +7,7 @@ from typing import Any
 from ..data_service.local_data import LocalDataService
 from ..data_service.remote_data import RemoteDataService
 from ..data_service.request_result import RequestResult
-from ..entry import APIEntry, APIEntryManager
+from ..entry import APIEntry, APIEntryManager, APIRequestContext
 from ..model import DataResource
 
 
@@ -48,10 +47,10 @@ class ApiTestService:
             query=query,
         )
         base_entries = selected_entries or self.api_mgr.list_entries()
-        entries = [self._with_runtime_test_defaults(entry) for entry in base_entries]
+        requests = [self._with_runtime_test_defaults(entry) for entry in base_entries]
 
         async for event in self.remote.stream_test_apis(
-            entries,
+            requests,
             persist_valid_result=self._persist_valid_result,
         ):
             yield event
@@ -72,16 +71,13 @@ class ApiTestService:
         return "test"
 
     @classmethod
-    def _with_runtime_test_defaults(cls, entry: APIEntry) -> APIEntry:
+    def _with_runtime_test_defaults(cls, entry: APIEntry) -> APIRequestContext:
         # Apply runtime-only defaults for blank params; do not mutate manager state.
-        cloned = copy.deepcopy(entry)
-        params = dict(cloned.params or {})
         filled: dict[str, Any] = {}
-        for key, value in params.items():
+        for key, value in (entry.params or {}).items():
             if cls._is_blank_runtime_value(value):
                 filled[key] = cls._build_default_test_param(str(key))
-        cloned.updated_params = filled
-        return cloned
+        return APIRequestContext(entry, filled)
 
     def _select_entries(
         self,
@@ -153,8 +149,9 @@ class ApiTestService:
             require_unique_name=False,
             resolve_site_name=resolve_site_name,
         )
-        entry = self._with_runtime_test_defaults(APIEntry(normalized))
-        result = await self.remote.get_data(entry)
+        request = self._with_runtime_test_defaults(APIEntry(normalized))
+        entry = request.entry
+        result = await self.remote.get_data(request, short_circuit=False)
         is_valid = result.is_valid()
         detail: dict[str, Any] = {
             "name": entry.name,
@@ -0,0 +1,108 @@
+"""Keyword matching benchmark: `APIEntryManager.match_entries` vs a linear scan.
+
+Builds a synthetic pool of random CJK keywords (every 50th one a regex),
+then times both paths over the same message stream and checks that they
+return the same entries. The linear scan is the pre-matcher behaviour:
+every entry's compiled keyword patterns are searched in turn.
+
+Run from an environment where the plugin can be imported (AstrBot installed):
+
+    python benchmarks/bench_keyword_match.py --entries 10000 --messages 1000
+"""
+
+import argparse
+import importlib
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PLUGIN_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PLUGIN_DIR.parent))
+aggregator = importlib.import_module(f"{PLUGIN_DIR.name}.api_aggregator")
+
+CHARS = [chr(c) for c in range(0x4E00, 0x4E00 + 800)]
+
+
+def random_word(rng: random.Random, low: int, high: int) -> str:
+    return "".join(rng.choice(CHARS) for _ in range(rng.randint(low, high)))
+
+
+def build_pool(rng: random.Random, size: int) -> list[dict]:
+    rows = []
+    for i in range(size):
+        keyword = random_word(rng, 2, 5)
+        keywords = [keyword] if i % 50 else [keyword + r"\d*"]
+        rows.append(
+            {
+                "name": f"api{i}",
+                "url": f"https://s{i % 40}.example.com/x",
+                "keywords": keywords,
+            }
+        )
+    return rows
+
+
+def build_messages(rng: random.Random, rows: list[dict], count: int) -> list[str]:
+    # One fifth exact commands, the rest misses (the common case in chats).
+    hits = [rng.choice(rows)["keywords"][0] for _ in range(count // 5)]
+    misses = [random_word(rng, 4, 4) for _ in range(count - len(hits))]
+    messages = hits + misses
+    rng.shuffle(messages)
+    return messages
+
+
+def linear_scan(entries: list, text: str) -> list[str]:
+    names = []
+    for entry, patterns in entries:
+        if not entry.enabled or not entry.valid:
+            continue
+        if any(p.search(text) for p in patterns):
+            names.append(entry.name)
+    return names
+
+
+def timed(label: str, fn, messages: list[str]) -> float:
+    start = time.perf_counter()
+    for text in messages:
+        fn(text)
+    per_message = (time.perf_counter() - start) / len(messages) * 1e6
+    print(f"{label:<14}{per_message:>12.1f} us/message")
+    return per_message
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = build_pool(rng, args.entries)
+    messages = build_messages(rng, rows, args.messages)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = aggregator.SQLiteDatabase(Path(tmp))
+        mgr = aggregator.APIEntryManager(db)
+        mgr.add_entries(rows, save=False)
+        compiled = [
+            (entry, [re.compile(k) for k in entry.keywords]) for entry in mgr.entries
+        ]
+
+        print(f"pool: {args.entries} entries, {len(messages)} messages")
+        legacy = timed("linear scan", lambda t: linear_scan(compiled, t), messages)
+        matcher = timed("match_entries", mgr.match_entries, messages)
+        print(f"speedup: {legacy / matcher:.1f}x")
+
+        for text in messages:
+            expected = sorted(linear_scan(compiled, text))
+            actual = sorted(entry.name for entry in mgr.match_entries(text))
+            if expected != actual:
+                raise SystemExit(f"result mismatch for {text!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,35 @@ class PluginConfig(BaseModel):
     need_prefix: bool = False
     save_data: bool = True
     use_local: bool = True
+    max_connections: int = 100
+    max_connections_per_host: int = 10
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 300
+    site_max_in_flight: int = 4
+    site_rate_limit: float = 5.0
+    site_burst: int = 5
+    site_queue_timeout: float = 3.0
+    max_text_size_mb: float = 5.0
+    max_image_size_mb: float = 20.0
+    max_video_size_mb: float = 200.0
+    max_audio_size_mb: float = 50.0
+    link_hedge_width: int = 3
+    link_timeout: float = 10.0
+    breaker_failure_threshold: int = 3
+    breaker_cooldown: float = 30.0
+    adaptive_timeout_factor: float = 3.0
+    adaptive_timeout_min: float = 3.0
+    adaptive_timeout_max: float = 120.0
+    response_cache_size: int = 256
+    negative_cache_ttl: float = 60.0
+    coalesce_requests: bool = True
+    latency_budget: float = 0.0
+    prefetch_depth: int = 3
+    prefetch_apis: list[str] = Field(default_factory=list)
+    prefetch_hot_threshold: int = 0
+    prefetch_max_mb: float = 200.0
+    prefetch_site_concurrency: int = 1
+    local_reconcile_interval: float = 300.0
     admin_ids: list[str] = Field(default_factory=list)
 
     model_config = ConfigDict(extra="ignore")
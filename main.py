@@ -8,7 +8,7 @@ from astrbot.api.star import Context, Star
 from astrbot.core.config.astrbot_config import AstrBotConfig
 from astrbot.core.star.filter.event_message_type import EventMessageType
 
-from .api_aggregator import APICoreApp, APIEntry, DataResource
+from .api_aggregator import APICoreApp, APIEntry, APIRequestContext, DataResource
 from .config import PluginConfig
 from .page_controller import APIPageController
 from .utils import get_nickname, get_reply_text
@@ -161,11 +161,14 @@ class APIPlugin(Star):
 
         event.should_call_llm(True)
         for entry in entries:
-            entry.updated_params = await self._build_params(event, entry, args)
+            request = APIRequestContext(
+                entry, await self._build_params(event, entry, args)
+            )
             try:
                 data = await self.core.data_service.fetch(
-                    entry,
+                    request,
                     use_local=self.cfg.use_local,
+                    save_data=self.cfg.save_data,
                 )
             except Exception as exc:
                 logger.error(f"data processing failed for {entry.name}: {exc}")
@@ -43,6 +43,7 @@ class APIPageController:
     def register_routes(self) -> None:
         routes = [
             ("/page/pool", self.get_pool, ["GET"], "Get API pool"),
+            ("/page/stats", self.get_stats, ["GET"], "Get runtime stats"),
             ("/page/pool/files", self.get_pool_files, ["GET"], "Get pool files"),
             (
                 "/page/pool/files/delete",
@@ -198,6 +199,11 @@ class APIPageController:
             [entry.to_dict() for entry in self.site_mgr.list_entries()],
             apis,
         )
+        circuits = self.remote.get_circuit_states()
+        for site in sites:
+            site["circuit"] = circuits["sites"].get(site.get("name", ""))
+        for api in apis:
+            api["circuit"] = circuits["apis"].get(api.get("name", ""))
         return self._ok(
             {
                 "sites": sites,
@@ -208,6 +214,29 @@ class APIPageController:
             }
         )
 
+    async def get_stats(self):
+        return self._ok(
+            {
+                "connections": self.remote.get_connection_stats(),
+                "sites": self.remote.get_scheduler_stats(),
+                "match_cache": self.api_mgr.get_match_cache_stats(),
+                "circuits": self.remote.get_circuit_states(),
+                "latency": self.remote.get_latency_stats(),
+                "negative_cache": self.remote.get_negative_cache_stats(),
+                "response_cache": self.core.response_cache.get_stats(),
+                "prefetch": (
+                    self.core.data_service.prefetch.get_stats()
+                    if self.core.data_service.prefetch is not None
+                    else {}
+                ),
+                "single_flight": (
+                    self.core.data_service.flights.get_stats()
+                    if self.core.data_service.flights is not None
+                    else {}
+                ),
+            }
+        )
+
     async def get_pool_files(self):
         try:
             base_dir = self.pool_io_service.pool_files_dir.resolve()
@@ -64,6 +64,9 @@ const I18N = (window.I18N = {
     type: "Data Type",
     valid: "Valid",
     invalid: "Invalid",
+    circuit_open: "Circuit open",
+    circuit_half_open: "Probing",
+    circuit_tooltip: "{failures} consecutive failures, next probe in {seconds}s",
     keywords: "Trigger Keywords",
     delete: "Delete",
     confirm_delete: "Confirm Delete",
@@ -270,6 +273,9 @@ const I18N = (window.I18N = {
     type: "数据类型",
     valid: "有效",
     invalid: "无效",
+    circuit_open: "已熔断",
+    circuit_half_open: "探测中",
+    circuit_tooltip: "连续失败 {failures} 次, {seconds} 秒后探测",
     keywords: "触发关键词",
     delete: "删除",
     confirm_delete: "确认删除",
@@ -991,6 +991,18 @@ function boolText(value) {
   return value ? t("true_text") : t("false_text");
 }
 
+function renderCircuitBadge(circuit) {
+  const stateName = textValue(circuit && circuit.state);
+  if (stateName !== "open" && stateName !== "half_open") return "";
+  const title = t("circuit_tooltip", {
+    failures: Number(circuit.failures || 0),
+    seconds: Number(circuit.retry_in || 0),
+  });
+  return ` <span class="circuit-badge is-${stateName}" title="${escapeHtml(title)}">${
+    escapeHtml(t(`circuit_${stateName}`))
+  }</span>`;
+}
+
 function formatItems(count) {
   return t("items_count", { count });
 }
@@ -1609,7 +1621,7 @@ function renderSites() {
           isPendingDelete("site", { name: textValue(s.name) }) ? "is-pending-delete-row" : ""
         }">
           <td>${Math.max(0, Number(sitePagination.start || 0)) + i + 1}</td>
-          <td><code class="name-code">${escapeHtml(s.name || "")}</code></td>
+          <td><code class="name-code">${escapeHtml(s.name || "")}</code>${renderCircuitBadge(s.circuit)}</td>
           <td class="url-cell">${renderSiteUrlCell(s.url || "")}</td>
           <td>${Number(s.timeout || 60)}</td>
           <td>
@@ -1698,7 +1710,7 @@ function renderApis() {
           isPendingDelete("api", { name: textValue(a.name) }) ? "is-pending-delete-row" : ""
         }">
           <td>${Math.max(0, Number(apiPagination.start || 0)) + i + 1}</td>
-          <td><code class="name-code">${escapeHtml(a.name || "")}</code></td>
+          <td><code class="name-code">${escapeHtml(a.name || "")}</code>${renderCircuitBadge(a.circuit)}</td>
           <td class="url-cell"><div class="url-scroll" title="${escapeHtml(a.url || "")}">${escapeHtml(a.url || "")}</div></td>
           <td>${formatTypeCell(a.type)}</td>
           <td>